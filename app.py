@@ -16,8 +16,8 @@ if os.path.exists(wsgi_path):
     spec.loader.exec_module(wsgi_module)
     app = wsgi_module.app
 else:
-    # Fallback: create app directly
-    from app import create_app
-    app = create_app()
+    # Fallback: use the package's app instance directly
+    from app import get_app
+    app = get_app()
 
 __all__ = ['app']
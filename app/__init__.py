@@ -5,11 +5,14 @@ Initialization and configuration
 
 from flask import Flask
 from flask_sqlalchemy import SQLAlchemy
-from flask_migrate import Migrate
 from flask_login import LoginManager
 from flask_wtf.csrf import CSRFProtect
 import os
 from dotenv import load_dotenv
+from app.utils.response_cache import ResponseCache
+from app.utils.static_assets import StaticAssets
+from app.utils.compression import CompressionMiddleware
+from app.utils.user_cache import UserCache
 
 # Load environment variables (silently fail if .env doesn't exist)
 try:
@@ -19,33 +22,55 @@ except Exception:
 
 # Initialize extensions
 db = SQLAlchemy()
-migrate = Migrate()
 login_manager = LoginManager()
 csrf = CSRFProtect()
+response_cache = ResponseCache()
+static_assets = StaticAssets()
+compression = CompressionMiddleware()
+user_cache = UserCache()
 
 def create_app(config_name='development'):
     """Application factory pattern"""
     import sys
+    from app.utils.boot import BootTimer, check_database
+    boot = BootTimer()
     print("Creating Flask application instance...", file=sys.stderr)
     app = Flask(__name__)
     
     # Load configuration
     try:
         print("Loading configuration...", file=sys.stderr)
-        from app.config import Config
-        app.config.from_object(Config)
-        print("✓ Configuration loaded", file=sys.stderr)
+        with boot.phase('config') as phase:
+            from app.config import Config
+            app.config.from_object(Config)
+            if app.config.get('TRACEMALLOC_FRAMES'):
+                from app.utils.memory import start_tracing
+                start_tracing(app.config['TRACEMALLOC_FRAMES'])
+        print(f"✓ Configuration loaded ({phase['ms']} ms)", file=sys.stderr)
     except Exception as e:
         print(f"✗ ERROR: Failed to load config: {e}", file=sys.stderr)
         raise
     
     # Initialize extensions with app
     print("Initializing extensions...", file=sys.stderr)
-    db.init_app(app)
-    migrate.init_app(app, db)
-    login_manager.init_app(app)
-    csrf.init_app(app)
-    print("✓ Extensions initialized", file=sys.stderr)
+    with boot.phase('extensions') as phase:
+        from app.utils.db_pool import configure_engine_options, instrument_engine
+        configure_engine_options(app)
+        db.init_app(app)
+        instrument_engine(app, db)
+        if os.environ.get('FLASK_RUN_FROM_CLI'):
+            # Alembic is only needed by `flask db` commands; web workers skip importing it
+            from flask_migrate import Migrate
+            Migrate(app, db)
+        login_manager.init_app(app)
+        csrf.init_app(app)
+        response_cache.init_app(app)
+        static_assets.init_app(app)
+        compression.init_app(app)
+        user_cache.init_app(app)
+        from app.utils.site_stats import register_stats_listeners
+        register_stats_listeners()
+    print(f"✓ Extensions initialized ({phase['ms']} ms)", file=sys.stderr)
     
     # Configure login manager
     login_manager.login_view = 'auth.login'
@@ -54,10 +79,9 @@ def create_app(config_name='development'):
     
     @login_manager.user_loader
     def load_user(user_id):
-        """Load user by ID for Flask-Login"""
+        """Load user by ID for Flask-Login (a cached snapshot, see app/utils/user_cache.py)"""
         try:
-            from app.models import User
-            return User.query.get(int(user_id))
+            return user_cache.load(int(user_id))
         except Exception:
             # Return None if user not found or database error
             return None
@@ -66,9 +90,10 @@ def create_app(config_name='development'):
     print("Registering blueprints...", file=sys.stderr)
     # Main routes (required)
     try:
-        from app.routes import main_bp
-        app.register_blueprint(main_bp)
-        print("✓ main_bp registered", file=sys.stderr)
+        with boot.phase('blueprint:main') as phase:
+            from app.routes import main_bp
+            app.register_blueprint(main_bp)
+        print(f"✓ main_bp registered ({phase['ms']} ms)", file=sys.stderr)
     except Exception as e:
         print(f"✗ ERROR: Failed to register main_bp: {e}", file=sys.stderr)
         import traceback
@@ -77,9 +102,10 @@ def create_app(config_name='development'):
     
     # Auth routes (required)
     try:
-        from app.auth import auth_bp
-        app.register_blueprint(auth_bp, url_prefix='/auth')
-        print("✓ auth_bp registered", file=sys.stderr)
+        with boot.phase('blueprint:auth') as phase:
+            from app.auth import auth_bp
+            app.register_blueprint(auth_bp, url_prefix='/auth')
+        print(f"✓ auth_bp registered ({phase['ms']} ms)", file=sys.stderr)
     except Exception as e:
         print(f"✗ ERROR: Failed to register auth_bp: {e}", file=sys.stderr)
         import traceback
@@ -88,9 +114,10 @@ def create_app(config_name='development'):
     
     # Admin routes (optional - only if admin module exists)
     try:
-        from app.admin import admin_bp
-        app.register_blueprint(admin_bp, url_prefix='/admin')
-        print("✓ admin_bp registered", file=sys.stderr)
+        with boot.phase('blueprint:admin') as phase:
+            from app.admin import admin_bp
+            app.register_blueprint(admin_bp, url_prefix='/admin')
+        print(f"✓ admin_bp registered ({phase['ms']} ms)", file=sys.stderr)
     except ImportError:
         # Admin module is optional
         print("⚠ admin_bp not found (optional)", file=sys.stderr)
@@ -102,9 +129,10 @@ def create_app(config_name='development'):
     
     # Stripe routes (optional - only if stripe module exists)
     try:
-        from app.stripe_handler import stripe_bp
-        app.register_blueprint(stripe_bp, url_prefix='/stripe')
-        print("✓ stripe_bp registered", file=sys.stderr)
+        with boot.phase('blueprint:stripe') as phase:
+            from app.stripe_handler import stripe_bp
+            app.register_blueprint(stripe_bp, url_prefix='/stripe')
+        print(f"✓ stripe_bp registered ({phase['ms']} ms)", file=sys.stderr)
     except ImportError:
         # Stripe module is optional
         print("⚠ stripe_bp not found (optional)", file=sys.stderr)
@@ -114,6 +142,33 @@ def create_app(config_name='development'):
         import traceback
         traceback.print_exc(file=sys.stderr)
     
+    # Register CLI commands
+    with boot.phase('cli'):
+        from app.cli import register_cli
+        register_cli(app)
+    
+    # Compiled template cache, and optional precompilation of every template
+    with boot.phase('templates') as phase:
+        from app.utils.template_cache import init_template_cache, warm_templates
+        init_template_cache(app)
+        if app.config.get('TEMPLATE_WARMUP'):
+            result = warm_templates(app)
+            phase['templates'] = result['templates']
+            print(f"✓ Templates warmed: {result['templates']} in {result['elapsed_ms']} ms", file=sys.stderr)
+    
+    # Check the database is reachable (the app still starts if it isn't)
+    if app.config.get('BOOT_CHECK_DATABASE'):
+        with boot.phase('database') as phase:
+            try:
+                with app.app_context():
+                    check_database(db)
+            except Exception as e:
+                boot.fail(phase, e)
+        if phase['ok']:
+            print(f"✓ Database reachable ({phase['ms']} ms)", file=sys.stderr)
+        else:
+            print(f"⚠ WARNING: Database check failed: {phase['error']}", file=sys.stderr)
+    
     # Register error handlers
     @app.errorhandler(404)
     def page_not_found(error):
@@ -134,21 +189,25 @@ def create_app(config_name='development'):
             # Fallback if template is missing
             return '<h1>500 Server Error</h1><p>An error occurred.</p>', 500
     
-    print("✓ Flask app initialization complete!", file=sys.stderr)
+    boot.finish()
+    app.extensions['boot_report'] = boot
+    print(f"✓ Flask app initialization complete! ({boot.total_ms} ms)", file=sys.stderr)
     return app
 
 # Export app instance for gunicorn when using 'gunicorn app:app'
-# This allows Render's auto-detection to work by making 'app' available at module level
-# Create app instance when this module is imported (lazy initialization)
+# The instance is built on first access of `app.app` (PEP 562 module __getattr__),
+# so importing the package or its submodules never creates a second app
 _app_instance = None
 
 def get_app():
-    """Get or create the Flask app instance"""
+    """Get or create the Flask app instance (one per process)"""
     global _app_instance
     if _app_instance is None:
         _app_instance = create_app()
     return _app_instance
 
-# Make 'app' available at module level for gunicorn
-# This is evaluated when gunicorn does 'from app import app'
-app = get_app()
+def __getattr__(name):
+    # This is evaluated when gunicorn does 'from app import app'
+    if name == 'app':
+        return get_app()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -2,11 +2,14 @@
 Admin panel routes
 """
 
-from flask import Blueprint, render_template, request, flash, redirect, url_for, abort
+from flask import Blueprint, render_template, request, flash, redirect, url_for, abort, jsonify, current_app, Response, stream_with_context
 from flask_login import login_required, current_user
 from app import db
-from app.models import User, Article, MembershipTransaction, MembershipStatus
+from app.models import User, Article, MembershipTransaction, MembershipStatus, MembershipType
+from app.utils.pagination import paginate_query
+from app.utils.streaming import stream_page
 from datetime import datetime
+import os
 import re
 
 admin_bp = Blueprint('admin', __name__)
@@ -25,19 +28,20 @@ def admin_required(f):
 @admin_required
 def index():
     """Admin dashboard"""
-    total_members = User.query.count()
-    active_members = User.query.filter_by(membership_status=MembershipStatus.ACTIVE).count()
-    total_articles = Article.query.count()
-    published_articles = Article.query.filter(Article.published_at.isnot(None)).count()
+    from app.utils.site_stats import get_site_stats
+    # One row of maintained counters instead of four COUNT scans
+    stats = get_site_stats()
     
-    recent_members = User.query.order_by(User.created_at.desc()).limit(5).all()
-    recent_articles = Article.query.order_by(Article.created_at.desc()).limit(5).all()
+    # Newest rows straight from the (created_at, id) indexes; authors in the same query
+    recent_members = User.query.order_by(User.created_at.desc(), User.id.desc()).limit(5).all()
+    recent_articles = Article.query.options(db.defer(Article.content), db.joinedload(Article.author)).order_by(
+        Article.created_at.desc(), Article.id.desc()).limit(5).all()
     
     return render_template('admin/dashboard.html',
-                         total_members=total_members,
-                         active_members=active_members,
-                         total_articles=total_articles,
-                         published_articles=published_articles,
+                         total_members=stats.total_members,
+                         active_members=stats.active_members,
+                         total_articles=stats.total_articles,
+                         published_articles=stats.published_articles,
                          recent_members=recent_members,
                          recent_articles=recent_articles)
 
@@ -46,8 +50,13 @@ def index():
 @admin_required
 def articles():
     """List all articles"""
-    articles = Article.query.order_by(Article.created_at.desc()).all()
-    return render_template('admin/articles.html', articles=articles)
+    # The list never shows article bodies, so don't load them
+    query = Article.query.options(db.defer(Article.content))
+    pagination = paginate_query(query, Article.created_at, Article.id,
+                                page=request.args.get('page', 1, type=int),
+                                per_page=current_app.config.get('ADMIN_PER_PAGE', 50),
+                                after=request.args.get('after'), before=request.args.get('before'))
+    return stream_page('admin/articles.html', articles=pagination.items, pagination=pagination)
 
 @admin_bp.route('/articles/new', methods=['GET', 'POST'])
 @login_required
@@ -85,6 +94,7 @@ def new_article():
             author_id=current_user.id,
             published_at=datetime.utcnow() if publish_now else None
         )
+        article.update_derived_fields()
         
         db.session.add(article)
         db.session.commit()
@@ -106,6 +116,7 @@ def edit_article(article_id):
         article.content = request.form.get('content')
         article.excerpt = request.form.get('excerpt')
         article.is_member_only = bool(request.form.get('is_member_only'))
+        article.update_derived_fields()
         
         # Update slug if title changed
         new_slug = re.sub(r'[^\w\s-]', '', article.title.lower())
@@ -145,9 +156,27 @@ def delete_article(article_id):
 @login_required
 @admin_required
 def members():
-    """List all members"""
-    members = User.query.order_by(User.created_at.desc()).all()
-    return render_template('admin/members.html', members=members)
+    """List members, optionally searched by name/email and filtered by status and type"""
+    from app.utils.member_search import filter_members, member_filters
+    filters = member_filters(request.args)
+    pagination = paginate_query(filter_members(User.query, filters), User.created_at, User.id,
+                                page=request.args.get('page', 1, type=int),
+                                per_page=current_app.config.get('ADMIN_PER_PAGE', 50),
+                                after=request.args.get('after'), before=request.args.get('before'))
+    return stream_page('admin/members.html', members=pagination.items, pagination=pagination,
+                       filters=filters, statuses=list(MembershipStatus), types=list(MembershipType))
+
+@admin_bp.route('/members/export.csv')
+@login_required
+@admin_required
+def export_members():
+    """Stream the (filtered) member list as CSV"""
+    from app.utils.member_search import export_members_csv, member_filters
+    filename = f"terralumen_members_{datetime.utcnow().strftime('%Y%m%d')}.csv"
+    return Response(stream_with_context(export_members_csv(member_filters(request.args))),
+                    mimetype='text/csv',
+                    headers={'Content-Disposition': f'attachment; filename={filename}',
+                             'Cache-Control': 'no-store'})
 
 @admin_bp.route('/members/<int:user_id>')
 @login_required
@@ -158,3 +187,40 @@ def view_member(user_id):
     transactions = MembershipTransaction.query.filter_by(user_id=user_id).order_by(MembershipTransaction.created_at.desc()).all()
     return render_template('admin/member_detail.html', user=user, transactions=transactions)
 
+
+@admin_bp.route('/metrics')
+@login_required
+@admin_required
+def metrics():
+    """Per-worker performance metrics (JSON)"""
+    from app.utils.blog_loader import get_cache_stats
+    from app.utils.blog_search import get_search_stats
+    from app.utils.content_pipeline import get_content_cache_stats
+    from app.utils.media import get_media_stats
+    from app.utils.template_cache import get_template_stats
+    from app.utils.feeds import get_feed_stats
+    from app.utils.db_pool import get_pool_stats
+    from app import response_cache, static_assets, compression, user_cache
+    return jsonify({
+        'pid': os.getpid(),
+        'blog_cache': get_cache_stats(),
+        'blog_search': get_search_stats(),
+        'rendered_content': get_content_cache_stats(),
+        'response_cache': response_cache.stats(),
+        'static_assets': static_assets.stats(),
+        'media': get_media_stats(),
+        'compression': compression.stats(),
+        'templates': get_template_stats(),
+        'feeds': get_feed_stats(),
+        'db_pool': get_pool_stats(db),
+        'user_cache': user_cache.stats(),
+    })
+
+@admin_bp.route('/memory')
+@login_required
+@admin_required
+def memory():
+    """RSS/PSS/USS, gc freeze count and top allocations of this worker (JSON)"""
+    from app.utils.memory import memory_report
+    limit = min(max(request.args.get('top', 15, type=int), 1), 100)
+    return jsonify(memory_report(limit))
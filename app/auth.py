@@ -118,7 +118,7 @@ def member_content():
         return redirect(url_for('main.membership'))
     
     from app.models import Article
-    articles = Article.query.filter_by(is_member_only=True).filter(
+    articles = Article.query.options(db.defer(Article.content)).filter_by(is_member_only=True).filter(
         Article.published_at.isnot(None)
     ).filter(
         Article.published_at <= datetime.utcnow()
@@ -0,0 +1,172 @@
+"""
+Flask CLI commands
+"""
+
+import json
+import time
+
+import click
+from flask.cli import AppGroup, with_appcontext
+
+blog_cli = AppGroup('blog', help='Blog content commands.')
+
+@blog_cli.command('build-bundle')
+def build_bundle_command():
+    """Pack app/data/blog/*.json into the memory-mapped blog bundle"""
+    from app.utils.blog_loader import GENERATION_PATH, build_bundle, bump_content_generation
+    result = build_bundle()
+    click.echo(f"✓ Bundled {result['articles']} articles into {result['path']} "
+               f"({result['metadata_bytes']} bytes metadata, {result['content_bytes']} bytes content)")
+    if GENERATION_PATH.exists():
+        click.echo(f"✓ Content generation bumped to {bump_content_generation()}")
+    from app.utils.content_pipeline import prune_content_cache
+    removed = prune_content_cache()
+    if removed:
+        click.echo(f"✓ Pruned {removed} stale entries from the rendered content cache")
+
+@blog_cli.command('reload')
+def reload_command():
+    """Bump the shared content generation so all workers reload articles"""
+    from app.utils.blog_loader import GENERATION_PATH, bump_content_generation
+    generation = bump_content_generation()
+    click.echo(f"✓ Content generation bumped to {generation} ({GENERATION_PATH})")
+
+@blog_cli.command('watch')
+@click.option('--interval', default=2.0, show_default=True, help='Seconds between directory polls.')
+def watch_command(interval):
+    """Poll the blog directory and bump the content generation on changes"""
+    from app.utils.blog_loader import BLOG_DIR, blog_directory_signature, bump_content_generation
+    click.echo(f"Watching {BLOG_DIR} every {interval}s (Ctrl+C to stop)")
+    signature = blog_directory_signature()
+    # Make sure the counter exists so workers switch to generation checks
+    generation = bump_content_generation()
+    click.echo(f"✓ Content generation {generation}")
+    try:
+        while True:
+            time.sleep(interval)
+            current = blog_directory_signature()
+            if current != signature:
+                signature = current
+                generation = bump_content_generation()
+                click.echo(f"✓ Blog content changed, generation bumped to {generation}")
+    except KeyboardInterrupt:
+        pass
+
+@blog_cli.command('stats')
+def blog_stats_command():
+    """Load the blog articles and print cache statistics"""
+    from app.utils.blog_loader import get_blog_index, get_cache_stats
+    get_blog_index()
+    for key, value in get_cache_stats().items():
+        click.echo(f"{key}: {value}")
+
+articles_cli = AppGroup('articles', help='Database article commands.')
+
+@articles_cli.command('refresh-derived')
+def refresh_derived_command():
+    """Recompute summary, word count and meta description for every DB article"""
+    from app import db
+    from app.models import Article
+    count = 0
+    for article in Article.query.yield_per(100):
+        article.update_derived_fields()
+        count += 1
+    db.session.commit()
+    click.echo(f"✓ Refreshed derived fields for {count} articles")
+
+assets_cli = AppGroup('assets', help='Static asset commands.')
+
+@assets_cli.command('build')
+def build_assets_command():
+    """Write fingerprinted, minified and precompressed static files"""
+    from app.utils.static_assets import build_assets
+    result = build_assets()
+    click.echo(f"✓ Built {result['files']} assets into {result['path']} "
+               f"({result['original_bytes']} bytes source, {result['smallest_bytes']} bytes smallest variants)")
+    if not result['brotli']:
+        click.echo("⚠ brotli not installed, only gzip variants were written")
+
+members_cli = AppGroup('members', help='Member directory commands.')
+
+@members_cli.command('build-search-index')
+def build_search_index_command():
+    """Create the substring search index on member names and emails"""
+    from app import db
+    from app.utils.member_search import build_search_index
+    kind = build_search_index(db)
+    if kind == 'none':
+        click.echo(f"⚠ No search index for {db.engine.dialect.name}; member search scans the table")
+    else:
+        click.echo(f"✓ Member search index ready ({kind})")
+
+stats_cli = AppGroup('stats', help='Dashboard statistics commands.')
+
+@stats_cli.command('reconcile')
+def reconcile_stats_command():
+    """Recount members and articles and correct the dashboard counters"""
+    from app.utils.site_stats import reconcile_site_stats
+    drift = reconcile_site_stats()
+    for name, delta in drift.items():
+        status = '✓' if delta == 0 else '⚠'
+        click.echo(f"{status} {name}: {'in step' if delta == 0 else f'corrected by {delta:+d}'}")
+
+@click.command('boot-report')
+@click.option('--json', 'as_json', is_flag=True, help='Print the report as JSON.')
+@with_appcontext
+def boot_report_command(as_json):
+    """Show how long each startup phase of this app instance took"""
+    from flask import current_app
+    report = current_app.extensions['boot_report'].report()
+    if as_json:
+        click.echo(json.dumps(report, indent=2))
+        return
+    for phase in report['phases']:
+        status = '✓' if phase['ok'] else '✗'
+        line = f"{status} {phase['name']:<20} {phase['ms']:10.3f} ms"
+        if not phase['ok']:
+            line += f"  ({phase['error']})"
+        click.echo(line)
+    click.echo(f"create_app total        {report['create_app_ms']:10.3f} ms")
+    if report['process_ready_ms'] is not None:
+        click.echo(f"process start to ready  {report['process_ready_ms']:10.1f} ms")
+
+@click.command('memory-report')
+@click.option('--pattern', default='gunicorn', show_default=True, help='Match server processes by program name.')
+@click.option('--json', 'as_json', is_flag=True, help='Print the report as JSON.')
+def memory_report_command(pattern, as_json):
+    """Show RSS, PSS and USS of each running server process"""
+    from app.utils.memory import find_processes, process_memory
+    processes = find_processes(pattern)
+    pids = {process['pid'] for process in processes}
+    for process in processes:
+        process['role'] = 'worker' if process['ppid'] in pids else 'master'
+        process['memory'] = process_memory(process['pid'])
+    if as_json:
+        click.echo(json.dumps(processes, indent=2))
+        return
+    if not processes:
+        click.echo(f"No running processes match '{pattern}'")
+        return
+    click.echo(f"{'pid':>8} {'role':<7} {'rss MB':>9} {'pss MB':>9} {'uss MB':>9}")
+    totals = {'rss_kb': 0, 'pss_kb': 0, 'uss_kb': 0}
+    for process in sorted(processes, key=lambda p: (p['role'] != 'master', p['pid'])):
+        memory = process['memory'] or {}
+        cells = []
+        for key in totals:
+            value = memory.get(key)
+            if value is not None:
+                totals[key] += value
+            cells.append(f"{value / 1024:9.1f}" if value is not None else f"{'?':>9}")
+        click.echo(f"{process['pid']:>8} {process['role']:<7} {' '.join(cells)}")
+    click.echo(f"{'total':>8} {'':<7} {' '.join(f'{value / 1024:9.1f}' for value in totals.values())}")
+    click.echo("PSS adds up to the memory the server really uses; USS is what each worker costs on its own")
+
+def register_cli(app):
+    """Register CLI command groups with the app"""
+    app.cli.add_command(blog_cli)
+    app.cli.add_command(articles_cli)
+    app.cli.add_command(assets_cli)
+    app.cli.add_command(stats_cli)
+    app.cli.add_command(members_cli)
+    app.cli.add_command(boot_report_command)
+    app.cli.add_command(memory_report_command)
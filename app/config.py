@@ -29,6 +29,24 @@ class Config:
         # Development: use SQLite with relative path
         SQLALCHEMY_DATABASE_URI = 'sqlite:///instance/terralumen.db'
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    # Connection pool per worker (see app/utils/db_pool.py); SQLALCHEMY_ENGINE_OPTIONS is built from these
+    DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE') or 5)
+    DB_MAX_OVERFLOW = int(os.environ.get('DB_MAX_OVERFLOW') or 5)
+    # Seconds to wait for a free connection; keep below the gunicorn timeout
+    DB_POOL_TIMEOUT = int(os.environ.get('DB_POOL_TIMEOUT') or 10)
+    DB_POOL_RECYCLE = int(os.environ.get('DB_POOL_RECYCLE') or 1800)
+    DB_POOL_SLOW_MS = 100
+    DB_CONNECT_TIMEOUT = int(os.environ.get('DB_CONNECT_TIMEOUT') or 5)
+    DB_STATEMENT_TIMEOUT_MS = int(os.environ.get('DB_STATEMENT_TIMEOUT_MS') or 15000)
+    # Connect through PgBouncer in transaction-pooling mode (no app-side pool)
+    DB_PGBOUNCER = os.environ.get('DB_PGBOUNCER', 'false').lower() in ['true', 'on', '1']
+    # SQLite: WAL journal so readers don't block the writer during local load tests
+    DB_SQLITE_WAL = os.environ.get('DB_SQLITE_WAL', 'true').lower() in ['true', 'on', '1']
+    DB_SQLITE_BUSY_TIMEOUT = 5000
+    # Time a test connection at startup (on by default when DATABASE_URL is set)
+    BOOT_CHECK_DATABASE = os.environ.get('BOOT_CHECK_DATABASE', 'true' if database_url else 'false').lower() in ['true', 'on', '1']
+    # Lets monitors read /health?detail=1 via the X-Health-Token header (admins always can)
+    HEALTH_TOKEN = os.environ.get('HEALTH_TOKEN')
     
     # Stripe configuration
     STRIPE_SECRET_KEY = os.environ.get('STRIPE_SECRET_KEY')
@@ -45,8 +63,56 @@ class Config:
     
     # Application settings
     POSTS_PER_PAGE = 10
+    ADMIN_PER_PAGE = int(os.environ.get('ADMIN_PER_PAGE') or 50)
+    # Seconds the row totals behind the admin page counts are reused
+    ADMIN_COUNT_CACHE_TTL = int(os.environ.get('ADMIN_COUNT_CACHE_TTL', 30))
     MEMBERSHIP_TYPES = ['annual', 'lifetime', 'supporter']
     
+    # Snapshot of the logged-in user kept per worker, dropped when the row changes
+    USER_CACHE_ENABLED = os.environ.get('USER_CACHE_ENABLED', 'true').lower() in ['true', 'on', '1']
+    USER_CACHE_TTL = int(os.environ.get('USER_CACHE_TTL') or 60)
+    USER_CACHE_MAX_ENTRIES = 1024
+    
+    # Admin dashboard counters are recounted from the base tables once they are this old
+    SITE_STATS_MAX_AGE_HOURS = int(os.environ.get('SITE_STATS_MAX_AGE_HOURS') or 24)
+    
+    # Full-response cache for anonymous visitors (per worker)
+    RESPONSE_CACHE_ENABLED = os.environ.get('RESPONSE_CACHE_ENABLED', 'true').lower() in ['true', 'on', '1']
+    RESPONSE_CACHE_TTL = int(os.environ.get('RESPONSE_CACHE_TTL') or 300)
+    RESPONSE_CACHE_MAX_ENTRIES = int(os.environ.get('RESPONSE_CACHE_MAX_ENTRIES') or 256)
+    RESPONSE_CACHE_ENDPOINTS = ['main.index', 'main.about', 'main.services', 'main.membership', 'main.blog']
+    
+    # Serve hashed, precompressed assets from `flask assets build` when built
+    STATIC_FINGERPRINT_ENABLED = os.environ.get('STATIC_FINGERPRINT_ENABLED', 'true').lower() in ['true', 'on', '1']
+    # Browser cache lifetime for /media videos (revalidated by ETag afterwards)
+    MEDIA_MAX_AGE = int(os.environ.get('MEDIA_MAX_AGE') or 86400)
+    
+    # gzip/brotli compression of text responses
+    COMPRESS_ENABLED = os.environ.get('COMPRESS_ENABLED', 'true').lower() in ['true', 'on', '1']
+    COMPRESS_MIN_SIZE = int(os.environ.get('COMPRESS_MIN_SIZE') or 500)
+    COMPRESS_LEVEL = 6
+    COMPRESS_BR_QUALITY = 4
+    
+    # Send long pages (blog, articles, admin lists) as they render
+    STREAM_TEMPLATES = os.environ.get('STREAM_TEMPLATES', 'true').lower() in ['true', 'on', '1']
+    STREAM_CHUNK_SIZE = 4096
+    
+    # Compiled Jinja templates shared by workers; empty disables the cache
+    JINJA_BYTECODE_CACHE_DIR = os.environ.get('JINJA_BYTECODE_CACHE_DIR', str(Path(__file__).resolve().parent / 'data' / 'jinja_cache'))
+    # Compile every template at startup instead of on first use
+    TEMPLATE_WARMUP = os.environ.get('TEMPLATE_WARMUP', 'false').lower() in ['true', 'on', '1']
+    
+    # Absolute URLs in sitemap.xml and the blog feeds
+    SITE_URL = os.environ.get('SITE_URL', 'https://terralumen.org')
+    FEED_TITLE = 'TerraLumen Blog'
+    FEED_LENGTH = 20
+    FEED_MAX_AGE = 300
+    
+    # Imported in the gunicorn master before forking when preloading (comma-separated)
+    PRELOAD_MODULES = [name.strip() for name in os.environ.get('PRELOAD_MODULES', 'app.utils.membership_card,stripe').split(',') if name.strip()]
+    # Trace allocations with this many frames for the memory report; 0 disables
+    TRACEMALLOC_FRAMES = int(os.environ.get('TRACEMALLOC_FRAMES') or 0)
+    
     # File upload settings
     UPLOAD_FOLDER = os.path.join(basedir, 'app', 'static', 'uploads')
     MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16MB max file size
@@ -32,13 +32,19 @@ class PaymentStatus(enum.Enum):
 class User(UserMixin, db.Model):
     """User model for members"""
     __tablename__ = 'users'
+    __table_args__ = (
+        # Keyset pagination of the admin member list
+        db.Index('ix_users_created_at_id', 'created_at', 'id'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     email = db.Column(db.String(120), unique=True, nullable=False, index=True)
     password_hash = db.Column(db.String(255), nullable=False)
     name = db.Column(db.String(100), nullable=False)
     membership_type = db.Column(db.Enum(MembershipType), nullable=True)
-    membership_status = db.Column(db.Enum(MembershipStatus), default=MembershipStatus.INACTIVE)
+    # Old values are loaded on change so the dashboard counters get the right delta
+    membership_status = db.mapped_column(db.Enum(MembershipStatus), default=MembershipStatus.INACTIVE,
+                                         active_history=True)
     stripe_customer_id = db.Column(db.String(255), nullable=True, index=True)
     stripe_subscription_id = db.Column(db.String(255), nullable=True)
     is_admin = db.Column(db.Boolean, default=False)
@@ -67,16 +73,24 @@ class User(UserMixin, db.Model):
 class Article(db.Model):
     """Blog article model"""
     __tablename__ = 'articles'
+    __table_args__ = (
+        # Keyset pagination of the admin article list
+        db.Index('ix_articles_created_at_id', 'created_at', 'id'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(200), nullable=False)
     slug = db.Column(db.String(200), unique=True, nullable=False, index=True)
     content = db.Column(db.Text, nullable=False)
     excerpt = db.Column(db.Text, nullable=True)
+    # Derived from content on save so listings don't need the full body
+    summary = db.Column(db.Text, nullable=True)
+    word_count = db.Column(db.Integer, nullable=True)
+    meta_description = db.Column(db.String(200), nullable=True)
     featured_image = db.Column(db.String(255), nullable=True)
     is_member_only = db.Column(db.Boolean, default=False)
     author_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
-    published_at = db.Column(db.DateTime, nullable=True)
+    published_at = db.mapped_column(db.DateTime, nullable=True, active_history=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
@@ -84,11 +98,28 @@ class Article(db.Model):
         """Check if article is published"""
         return self.published_at is not None and self.published_at <= datetime.utcnow()
     
+    def update_derived_fields(self):
+        """Recompute summary, word count and meta description from content"""
+        from app.utils.text import content_derivatives
+        derived = content_derivatives(self.content, self.excerpt)
+        self.summary = derived['summary']
+        self.word_count = derived['word_count']
+        self.meta_description = derived['meta_description']
+    
+    @property
+    def html(self):
+        """Sanitized, enriched content HTML (cached by content hash)"""
+        from app.utils.content_pipeline import render_content
+        return render_content(self.content).html
+    
     def reading_time(self):
         """Estimate reading time in minutes"""
-        words_per_minute = 200
-        word_count = len(self.content.split())
-        return max(1, round(word_count / words_per_minute))
+        from app.utils.text import content_derivatives, reading_time
+        word_count = self.word_count
+        if word_count is None:
+            # Rows saved before word_count existed; `flask articles refresh-derived` backfills them
+            word_count = content_derivatives(self.content, self.excerpt)['word_count']
+        return reading_time(word_count)
     
     def __repr__(self):
         return f'<Article {self.title}>'
@@ -111,3 +142,18 @@ class MembershipTransaction(db.Model):
     def __repr__(self):
         return f'<MembershipTransaction {self.id} - {self.status.value}>'
 
+
+class SiteStats(db.Model):
+    """Single-row dashboard counters, maintained by app/utils/site_stats.py"""
+    __tablename__ = 'site_stats'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    total_members = db.Column(db.Integer, nullable=False, default=0)
+    active_members = db.Column(db.Integer, nullable=False, default=0)
+    total_articles = db.Column(db.Integer, nullable=False, default=0)
+    published_articles = db.Column(db.Integer, nullable=False, default=0)
+    reconciled_at = db.Column(db.DateTime, nullable=True)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    def __repr__(self):
+        return f'<SiteStats members={self.total_members} articles={self.total_articles}>'
@@ -3,15 +3,68 @@ Main public routes
 """
 
 from flask import Blueprint, render_template, request, flash, redirect, url_for, current_app
-from app import db
+from app import db, response_cache
+from app.utils.streaming import stream_page
 from datetime import datetime
 
 main_bp = Blueprint('main', __name__)
 
+# Serve anonymous marketing and blog pages from the response cache
+main_bp.before_request(response_cache.lookup)
+main_bp.after_request(response_cache.store)
+
+def _viewer_is_member():
+    """Check if the current user is an authenticated, active member"""
+    from flask_login import current_user
+    if not current_user.is_authenticated:
+        return False
+    try:
+        return hasattr(current_user, 'is_active_member') and current_user.is_active_member()
+    except Exception:
+        return False
+
 @main_bp.route('/health')
 def health():
-    """Health check endpoint for Render"""
-    return {'status': 'ok', 'service': 'terralumen'}, 200
+    """Health check endpoint for Render (?detail=1 adds boot timings and dependencies for admins)"""
+    payload = {'status': 'ok', 'service': 'terralumen'}
+    if request.args.get('detail') and _may_see_health_details():
+        payload.update(_health_details())
+    return payload, 200
+
+def _may_see_health_details():
+    """Admins, or callers presenting HEALTH_TOKEN in the X-Health-Token header"""
+    import hmac
+    from flask_login import current_user
+    token = current_app.config.get('HEALTH_TOKEN')
+    presented = request.headers.get('X-Health-Token')
+    if token and presented and hmac.compare_digest(token, presented):
+        return True
+    return current_user.is_authenticated and bool(getattr(current_user, 'is_admin', False))
+
+def _health_details():
+    """Boot report, uptime and dependency checks for the detailed health payload"""
+    import time
+    from app.utils.boot import check_database, process_age_seconds
+    from app.utils.blog_loader import get_content_version
+    from app.utils.db_pool import get_pool_stats
+    details = {
+        'boot': current_app.extensions['boot_report'].report(),
+        'uptime_seconds': process_age_seconds(),
+        'content_version': get_content_version(),
+    }
+    started = time.perf_counter()
+    try:
+        check_database(db)
+        details['database'] = {'ok': True, 'ms': round((time.perf_counter() - started) * 1000, 3)}
+    except Exception:
+        # The error text can name the database host and user; keep it in the log
+        current_app.logger.exception("Health check database ping failed")
+        details['database'] = {'ok': False}
+    try:
+        details['database']['pool'] = get_pool_stats(db)
+    except Exception:
+        pass
+    return details
 
 @main_bp.route('/')
 def index():
@@ -53,99 +106,97 @@ def contact():
     
     return render_template('contact.html')
 
-@main_bp.route('/blog')
-def blog():
-    """Blog listing page - No database required"""
+@main_bp.route('/blog', defaults={'tag': None})
+@main_bp.route('/blog/tag/<tag>')
+def blog(tag):
+    """Blog listing page, optionally filtered by tag - No database required"""
+    from app.utils.blog_loader import get_blog_index, normalize_tag
+    
+    # One validated index for the whole request
+    index = get_blog_index()
+    tag_name = None
+    if tag is not None:
+        tag_name = index.tag_names.get(normalize_tag(tag))
+        if tag_name is None:
+            from flask import abort
+            abort(404)
+    
     try:
-        from app.utils.blog_loader import load_blog_articles
-        from flask_login import current_user
+        from app.utils.http_cache import page_validators
         
-        # Load all articles
-        all_articles = load_blog_articles()
+        # Published articles visible to this viewer come prebuilt from the index
+        is_member = _viewer_is_member()
+        visible, last_modified = index.listing_state(is_member=is_member)
+        validators = page_validators(index.fingerprint, visible, last_modified=last_modified)
+        if validators is not None:
+            not_modified = validators.not_modified()
+            if not_modified is not None:
+                return not_modified
         
-        # Filter published articles
-        published_articles = [a for a in all_articles if a.is_published()]
-        
-        # Check if user is authenticated member
-        is_member = False
-        if current_user.is_authenticated:
-            try:
-                is_member = hasattr(current_user, 'is_active_member') and current_user.is_active_member()
-            except:
-                is_member = False
-        
-        # Filter by member-only status
-        if is_member:
-            # Show all published articles (including member-only)
-            articles = published_articles
-        else:
-            # Only show public articles
-            articles = [a for a in published_articles if not a.is_member_only]
-        
-        # Simple pagination
         page = request.args.get('page', 1, type=int)
         per_page = current_app.config.get('POSTS_PER_PAGE', 10)
-        total = len(articles)
-        start = (page - 1) * per_page
-        end = start + per_page
-        paginated_articles = articles[start:end]
+        pagination = index.paginate(page, per_page, is_member=is_member, tag=tag,
+                                    after=request.args.get('after'), before=request.args.get('before'))
+        tag_counts = index.tag_counts(is_member=is_member)
         
-        # Create simple pagination object
-        class SimplePagination:
-            def __init__(self, items, page, per_page, total):
-                self.items = items
-                self.page = page
-                self.per_page = per_page
-                self.total = total
-                self.pages = (total + per_page - 1) // per_page if total > 0 else 1
-                self.has_prev = page > 1
-                self.has_next = page < self.pages
-                self.prev_num = page - 1 if self.has_prev else None
-                self.next_num = page + 1 if self.has_next else None
-            
-            def iter_pages(self, left_edge=1, right_edge=1, left_current=2, right_current=2):
-                """Simple page iterator for compatibility"""
-                if self.pages <= 10:
-                    return range(1, self.pages + 1)
-                # For many pages, show first, last, and current area
-                pages = []
-                for i in range(1, min(left_edge + 1, self.pages + 1)):
-                    pages.append(i)
-                if left_edge < self.page - left_current - 1:
-                    pages.append(None)  # Ellipsis
-                for i in range(max(1, self.page - left_current), min(self.page + right_current + 1, self.pages + 1)):
-                    if i not in pages:
-                        pages.append(i)
-                if self.page + right_current < self.pages - right_edge:
-                    pages.append(None)  # Ellipsis
-                for i in range(max(1, self.pages - right_edge + 1), self.pages + 1):
-                    if i not in pages:
-                        pages.append(i)
-                return pages
-        
-        pagination = SimplePagination(paginated_articles, page, per_page, total)
-        
-        return render_template('blog.html', articles=paginated_articles, pagination=pagination)
+        response = stream_page('blog.html', articles=pagination.items, pagination=pagination,
+                               tag=tag, tag_name=tag_name, tag_counts=tag_counts)
+        return validators.apply(response) if validators is not None else response
     except Exception as e:
         current_app.logger.error(f"Error loading blog: {e}")
         import traceback
         traceback.print_exc()
         # Return empty blog page on error
-        class SimplePagination:
-            def __init__(self):
-                self.items = []
-                self.page = 1
-                self.pages = 1
-                self.has_prev = False
-                self.has_next = False
-        return render_template('blog.html', articles=[], pagination=SimplePagination())
+        from app.utils.pagination import Pagination
+        from app.utils.response_cache import skip_response_cache
+        skip_response_cache()
+        return render_template('blog.html', articles=[], pagination=Pagination.empty(),
+                               tag=tag, tag_name=tag_name, tag_counts=[])
+
+@main_bp.route('/media/<path:filename>')
+def media(filename):
+    """Hero videos with byte-range support"""
+    from app.utils.media import send_media
+    return send_media(filename)
+
+@main_bp.route('/sitemap.xml')
+def sitemap():
+    """Sitemap of public pages and articles, served from cached bytes"""
+    from app.utils.feeds import document_response, get_sitemap
+    return document_response(get_sitemap())
+
+@main_bp.route('/blog/feed.xml')
+def blog_feed():
+    """Atom feed of the newest public articles"""
+    from app.utils.feeds import document_response, get_atom_feed
+    return document_response(get_atom_feed())
+
+@main_bp.route('/blog/rss.xml')
+def blog_rss():
+    """RSS feed of the newest public articles"""
+    from app.utils.feeds import document_response, get_rss_feed
+    return document_response(get_rss_feed())
+
+@main_bp.route('/blog/search')
+def blog_search():
+    """Full-text search over published blog articles"""
+    query = request.args.get('q', '').strip()
+    articles = []
+    if query:
+        try:
+            from app.utils.blog_search import search_articles
+            articles = search_articles(query, is_member=_viewer_is_member())
+        except Exception as e:
+            current_app.logger.error(f"Error searching blog for {query!r}: {e}")
+            import traceback
+            traceback.print_exc()
+    return render_template('blog_search.html', query=query, articles=articles)
 
 @main_bp.route('/blog/<slug>')
 def article(slug):
     """Individual article page - No database required"""
     try:
         from app.utils.blog_loader import get_article_by_slug
-        from flask_login import current_user
         
         article = get_article_by_slug(slug)
         if not article:
@@ -159,18 +210,20 @@ def article(slug):
         
         # Check if article is member-only and user has access
         if article.is_member_only:
-            is_member = False
-            if current_user.is_authenticated:
-                try:
-                    is_member = hasattr(current_user, 'is_active_member') and current_user.is_active_member()
-                except:
-                    is_member = False
-            
-            if not is_member:
+            if not _viewer_is_member():
                 flash('This article is available to members only. Please log in or become a member to access it.', 'info')
                 return redirect(url_for('auth.login'))
         
-        return render_template('article.html', article=article)
+        from app.utils.http_cache import page_validators
+        validators = page_validators(article.source_hash,
+                                     last_modified=max(article.modified_ts or 0, article.published_ts) or None)
+        if validators is not None:
+            not_modified = validators.not_modified()
+            if not_modified is not None:
+                return not_modified
+        
+        response = stream_page('article.html', article=article)
+        return validators.apply(response) if validators is not None else response
     except Exception as e:
         current_app.logger.error(f"Error loading article {slug}: {e}")
         import traceback
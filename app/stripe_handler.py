@@ -1,24 +1,29 @@
 """
 Stripe payment handling
+
+The stripe SDK is imported on first use rather than at startup, since only
+these routes need it.
 """
 
-import stripe
 from flask import Blueprint, request, jsonify, redirect, url_for, flash, current_app
-from flask_login import login_required, current_user
+from flask_login import login_required
 from app import db
 from app.models import User, MembershipTransaction, MembershipType, MembershipStatus, PaymentStatus
+from app.utils.user_cache import current_user_model
 
 stripe_bp = Blueprint('stripe', __name__)
 
 def init_stripe():
-    """Initialize Stripe with API key"""
+    """Import the Stripe SDK and set the API key"""
+    import stripe
     stripe.api_key = current_app.config.get('STRIPE_SECRET_KEY')
+    return stripe
 
 @stripe_bp.route('/create-checkout-session', methods=['POST'])
 @login_required
 def create_checkout_session():
     """Create Stripe checkout session"""
-    init_stripe()
+    stripe = init_stripe()
     
     membership_type = request.form.get('membership_type', 'annual')
     price_id = request.form.get('price_id')  # Stripe Price ID
@@ -28,14 +33,17 @@ def create_checkout_session():
         return redirect(url_for('main.membership'))
     
     try:
+        # The real row, not the cached snapshot: this view may update it
+        user = current_user_model()
+        
         # Create or retrieve Stripe customer
-        if not current_user.stripe_customer_id:
+        if not user.stripe_customer_id:
             customer = stripe.Customer.create(
-                email=current_user.email,
-                name=current_user.name,
-                metadata={'user_id': str(current_user.id)}
+                email=user.email,
+                name=user.name,
+                metadata={'user_id': str(user.id)}
             )
-            current_user.stripe_customer_id = customer.id
+            user.stripe_customer_id = customer.id
             db.session.commit()
         
         # Determine if it's a subscription or one-time payment
@@ -45,7 +53,7 @@ def create_checkout_session():
         if is_subscription:
             # Create subscription checkout session
             checkout_session = stripe.checkout.Session.create(
-                customer=current_user.stripe_customer_id,
+                customer=user.stripe_customer_id,
                 payment_method_types=['card'],
                 line_items=[{
                     'price': price_id,
@@ -55,14 +63,14 @@ def create_checkout_session():
                 success_url=url_for('stripe.success', _external=True) + '?session_id={CHECKOUT_SESSION_ID}',
                 cancel_url=url_for('main.membership', _external=True),
                 metadata={
-                    'user_id': str(current_user.id),
+                    'user_id': str(user.id),
                     'membership_type': membership_type
                 }
             )
         elif is_lifetime:
             # Create one-time payment checkout session
             checkout_session = stripe.checkout.Session.create(
-                customer=current_user.stripe_customer_id,
+                customer=user.stripe_customer_id,
                 payment_method_types=['card'],
                 line_items=[{
                     'price': price_id,
@@ -72,14 +80,14 @@ def create_checkout_session():
                 success_url=url_for('stripe.success', _external=True) + '?session_id={CHECKOUT_SESSION_ID}',
                 cancel_url=url_for('main.membership', _external=True),
                 metadata={
-                    'user_id': str(current_user.id),
+                    'user_id': str(user.id),
                     'membership_type': membership_type
                 }
             )
         else:
             # Supporter member (donation)
             checkout_session = stripe.checkout.Session.create(
-                customer=current_user.stripe_customer_id,
+                customer=user.stripe_customer_id,
                 payment_method_types=['card'],
                 line_items=[{
                     'price': price_id,
@@ -89,7 +97,7 @@ def create_checkout_session():
                 success_url=url_for('stripe.success', _external=True) + '?session_id={CHECKOUT_SESSION_ID}',
                 cancel_url=url_for('main.membership', _external=True),
                 metadata={
-                    'user_id': str(current_user.id),
+                    'user_id': str(user.id),
                     'membership_type': membership_type
                 }
             )
@@ -114,24 +122,25 @@ def success():
         return redirect(url_for('main.membership'))
     
     try:
-        init_stripe()
+        stripe = init_stripe()
         session = stripe.checkout.Session.retrieve(session_id)
+        user = current_user_model()
         
-        if session.customer != current_user.stripe_customer_id:
+        if session.customer != user.stripe_customer_id:
             flash('Invalid session for your account.', 'error')
             return redirect(url_for('main.membership'))
         
         # Update user membership status
         if session.payment_status == 'paid':
-            current_user.membership_status = MembershipStatus.ACTIVE
+            user.membership_status = MembershipStatus.ACTIVE
             
             # Store subscription ID if it's a subscription
             if session.mode == 'subscription':
-                current_user.stripe_subscription_id = session.subscription
+                user.stripe_subscription_id = session.subscription
             
             # Create transaction record
             transaction = MembershipTransaction(
-                user_id=current_user.id,
+                user_id=user.id,
                 stripe_payment_intent_id=session.payment_intent,
                 amount=session.amount_total / 100,  # Convert from cents
                 currency=session.currency.upper(),
@@ -158,8 +167,8 @@ def webhook():
     sig_header = request.headers.get('Stripe-Signature')
     endpoint_secret = current_app.config.get('STRIPE_WEBHOOK_SECRET')
     
+    stripe = init_stripe()
     try:
-        init_stripe()
         event = stripe.Webhook.construct_event(
             payload, sig_header, endpoint_secret
         )
@@ -1,56 +1,180 @@
 """
 Blog loader utility - Loads blog articles from JSON files
 No database required
+
+Articles are parsed once per worker and kept in an in-process cache that is
+rebuilt only when the blog directory listing or a file's mtime/size changes.
+When the shared generation counter exists (created by `flask blog reload`),
+workers skip the directory walk and rebuild only when the counter changes.
+
+`flask blog build-bundle` packs the JSON files into a single bundle: a compact
+metadata table followed by a blob of article bodies. When the bundle matches
+the current directory it is memory-mapped instead of parsing JSON, so workers
+share its pages and article content is only read when a page renders it.
 """
 
+import bisect
+import hashlib
 import json
+import mmap
 import os
+import struct
+import threading
+import time
 from pathlib import Path
-from datetime import datetime
-from typing import List, Dict, Optional
+from datetime import datetime, timezone
+from typing import List, Dict, Optional, Tuple
+
+from markupsafe import Markup
+
+from app.utils.content_generation import GenerationCounter
+from app.utils.pagination import Pagination, decode_cursor, encode_cursor
+from app.utils.content_pipeline import PIPELINE_VERSION, TocEntry, render_content
+from app.utils.text import content_derivatives, reading_time
+
+# Go up: utils -> app, then into data/blog
+BLOG_DIR = Path(__file__).resolve().parent.parent / 'data' / 'blog'
+BUNDLE_PATH = BLOG_DIR.parent / 'blog.bundle'
+GENERATION_PATH = Path(os.environ.get('BLOG_GENERATION_FILE') or BLOG_DIR.parent / 'blog.generation')
+
+# Bundle layout: magic, metadata length, metadata JSON, content blob
+BUNDLE_MAGIC = b'TLBLOG03'
+_BUNDLE_HEADER = struct.Struct('<8sQ')
 
 class BlogArticle:
-    """Simple blog article class"""
+    """Compact blog article record
+    
+    Uses __slots__ instead of a per-instance __dict__. The publish date is kept
+    as a UTC epoch timestamp; the datetime is only built when a template asks
+    for it. The plain-text summary, word count and meta description are
+    precomputed in bundles; for JSON files they are derived from the content
+    the first time a page asks for them, so loading stays cheap.
+    
+    Bundled articles store the sanitized, enriched HTML produced by the
+    content pipeline, so `content` and `html` are the same bytes there.
+    
+    `source_hash` and `modified_ts` identify the source file version and
+    back the HTTP validators for article pages.
+    """
+    __slots__ = ('id', 'title', 'slug', 'excerpt', 'author', 'is_member_only', 'tags',
+                 'featured_image', 'published_ts', '_published_at', '_content', '_content_ref',
+                 '_summary', '_word_count', '_meta_description', '_rendered', '_toc',
+                 '_source_hash', 'modified_ts')
+    
     def __init__(self, data: dict):
         self.id = data.get('id')
         self.title = data.get('title', '')
         self.slug = data.get('slug', '')
-        self.content = data.get('content', '')
+        self._content = data.get('content', '')
+        # (buffer, offset, length) when content lives in a memory-mapped bundle
+        self._content_ref = None
         self.excerpt = data.get('excerpt', '')
         self.author = data.get('author', 'TerraLumen Team')
-        self.published_at = data.get('published_at')
         self.is_member_only = data.get('is_member_only', False)
         self.tags = data.get('tags', [])
         self.featured_image = data.get('featured_image', '')
+        self._published_at = None
+        
+        # Bundles store the timestamp precomputed; JSON files store ISO strings
+        published_ts = data.get('published_ts')
+        if published_ts is None:
+            published_ts = _parse_timestamp(data.get('published_at'))
+        self.published_ts: Optional[float] = published_ts
+        
+        # Bundles store derived fields precomputed; otherwise derived on first use
+        self._summary = data.get('summary')
+        self._word_count = data.get('word_count')
+        self._meta_description = data.get('meta_description')
+        self._rendered = None
+        self._toc = [TocEntry(*entry) for entry in data['toc']] if 'toc' in data else None
         
-        # Parse published_at if it's a string
-        if isinstance(self.published_at, str):
-            try:
-                # Handle ISO format with or without timezone
-                date_str = self.published_at.replace('Z', '+00:00')
-                self.published_at = datetime.fromisoformat(date_str)
-                # Convert to naive UTC datetime for easier comparison
-                if self.published_at.tzinfo is not None:
-                    from datetime import timezone
-                    self.published_at = self.published_at.astimezone(timezone.utc).replace(tzinfo=None)
-            except Exception as e:
-                print(f"Error parsing date {self.published_at}: {e}")
-                self.published_at = None
+        # Set by the loaders from the file bytes and mtime; hashed from the fields on first use otherwise
+        self._source_hash = data.get('source_hash')
+        self.modified_ts: Optional[float] = data.get('modified_ts')
+    
+    def _derive(self):
+        derived = content_derivatives(self.content, self.excerpt)
+        self._summary = derived['summary']
+        self._word_count = derived['word_count']
+        self._meta_description = derived['meta_description']
+    
+    @property
+    def summary(self) -> str:
+        """Plain-text summary for listings"""
+        if self._word_count is None:
+            self._derive()
+        return self._summary or ''
+    
+    @property
+    def word_count(self) -> int:
+        if self._word_count is None:
+            self._derive()
+        return self._word_count
+    
+    @property
+    def meta_description(self) -> str:
+        if self._word_count is None:
+            self._derive()
+        return self._meta_description or ''
+    
+    @property
+    def source_hash(self) -> str:
+        """Fingerprint of the article source"""
+        if self._source_hash is None:
+            fields = [self.id, self.title, self.slug, self.content, self.excerpt, self.author,
+                      self.is_member_only, self.tags, self.featured_image, self.published_ts]
+            self._source_hash = _source_hash(json.dumps(fields, default=str).encode('utf-8'))
+        return self._source_hash
+    
+    @property
+    def published_at(self) -> Optional[datetime]:
+        """Publish date as a naive UTC datetime, decoded on first use"""
+        if self._published_at is None and self.published_ts is not None:
+            self._published_at = datetime.fromtimestamp(self.published_ts, timezone.utc).replace(tzinfo=None)
+        return self._published_at
+    
+    @property
+    def content(self) -> str:
+        """Full article HTML, read from the bundle on each access if mapped"""
+        if self._content_ref is not None:
+            buf, offset, length = self._content_ref
+            return buf[offset:offset + length].decode('utf-8')
+        return self._content
+    
+    def _render(self):
+        if self._rendered is None:
+            self._rendered = render_content(self._content)
+        return self._rendered
+    
+    @property
+    def html(self) -> Markup:
+        """Sanitized article HTML with image hints and heading anchors"""
+        if self._content_ref is not None:
+            # Bundles hold the pipeline output already
+            return Markup(self.content)
+        return self._render().html
+    
+    @property
+    def toc(self) -> List[TocEntry]:
+        """Table of contents entries for the article headings"""
+        if self._toc is not None:
+            return self._toc
+        return self._render().toc
+    
+    @classmethod
+    def from_bundle(cls, meta: dict, buf: mmap.mmap, content_start: int) -> 'BlogArticle':
+        """Create an article from a bundle metadata row without reading its content"""
+        article = cls(meta)
+        article._content_ref = (buf, content_start + meta['offset'], meta['length'])
+        return article
+    
+    def reading_time(self) -> int:
+        """Estimated reading time in minutes"""
+        return reading_time(self.word_count)
     
     def is_published(self) -> bool:
         """Check if article is published"""
-        if not self.published_at:
-            return False
-        # Convert both to naive UTC datetimes for comparison
-        now = datetime.utcnow()
-        published = self.published_at
-        
-        # Remove timezone info if present
-        if published.tzinfo is not None:
-            from datetime import timezone
-            published = published.astimezone(timezone.utc).replace(tzinfo=None)
-            
-        return published <= now
+        return self.published_ts is not None and self.published_ts <= time.time()
     
     def to_dict(self) -> dict:
         """Convert to dictionary"""
@@ -67,52 +191,494 @@ class BlogArticle:
             'featured_image': self.featured_image
         }
 
-def load_blog_articles() -> List[BlogArticle]:
-    """Load all blog articles from JSON files"""
-    articles = []
-    # Get the project root directory
-    current_file = Path(__file__).resolve()
-    # Go up: utils -> app -> terralumen_website
-    blog_dir = current_file.parent.parent.parent / 'app' / 'data' / 'blog'
-    
-    # Create directory if it doesn't exist
-    blog_dir.mkdir(parents=True, exist_ok=True)
-    
-    # Load articles from JSON files
-    if blog_dir.exists():
-        for json_file in blog_dir.glob('*.json'):
-            # Skip .gitkeep and other non-article files
-            if json_file.name.startswith('.'):
-                continue
-            try:
-                with open(json_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    article = BlogArticle(data)
-                    articles.append(article)
-            except Exception as e:
-                print(f"Error loading {json_file}: {e}")
-                continue
-    
-    # Sort by published_at (newest first)
-    articles.sort(key=lambda x: x.published_at if x.published_at else datetime.min, reverse=True)
+def _source_hash(raw: bytes) -> str:
+    """Fingerprint of an article's source file"""
+    return hashlib.sha1(raw).hexdigest()
+
+def _read_article_file(entry: os.DirEntry) -> dict:
+    """Parse an article JSON file, recording its source hash and mtime"""
+    with open(entry.path, 'rb') as f:
+        raw = f.read()
+    data = json.loads(raw.decode('utf-8'))
+    data['source_hash'] = _source_hash(raw)
+    data['modified_ts'] = entry.stat().st_mtime
+    return data
+
+def _parse_timestamp(value) -> Optional[float]:
+    """Convert an ISO date string (or datetime) to UTC epoch seconds"""
+    if not value:
+        return None
+    try:
+        if isinstance(value, str):
+            # Handle ISO format with or without timezone
+            value = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        # Naive datetimes are treated as UTC
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return value.timestamp()
+    except Exception as e:
+        print(f"Error parsing date {value}: {e}")
+        return None
+
+class PostingList:
+    """Newest-first dated articles with a parallel array of sort keys
+    
+    Keys are (-published_ts, slug), ascending, so the articles visible at a
+    given time and the position of a pagination cursor are both found by
+    bisecting instead of scanning.
+    """
+    __slots__ = ('articles', 'keys')
+    
+    def __init__(self, articles: List[BlogArticle]):
+        self.articles = articles
+        self.keys = [(-a.published_ts, a.slug) for a in articles]
+    
+    def first_visible(self, now: Optional[datetime] = None) -> int:
+        """Index of the newest article published at or before now"""
+        now_ts = _timestamp(now) if now is not None else time.time()
+        return bisect.bisect_left(self.keys, (-now_ts,))
+    
+    def next_publish_ts(self, now: Optional[datetime] = None) -> Optional[float]:
+        """Timestamp of the next scheduled article, if any"""
+        first = self.first_visible(now)
+        return -self.keys[first - 1][0] if first else None
+    
+    def position(self, published_ts: float, slug: str) -> Tuple[int, int]:
+        """Insertion points around a cursor key (before it, after it)"""
+        key = (-published_ts, slug)
+        return bisect.bisect_left(self.keys, key), bisect.bisect_right(self.keys, key)
+
+class BlogIndex:
+    """Precomputed lookups over a fixed set of articles
+    
+    Holds a slug map plus posting lists of dated articles for the public and
+    member views, overall and per tag. Tags are matched case-insensitively.
+    `fingerprint` changes whenever any article's source does; `version` is
+    the worker-local rebuild number it was loaded as.
+    """
+    def __init__(self, articles: List[BlogArticle]):
+        self.version = 0
+        # Sort by published_at (newest first), then slug; undated articles last
+        self.articles = sorted(articles, key=lambda x: (x.published_ts is None, -(x.published_ts or 0), x.slug))
+        self.by_slug: Dict[str, BlogArticle] = {}
+        for article in self.articles:
+            # First (newest) article wins on duplicate slugs
+            self.by_slug.setdefault(article.slug, article)
+        
+        digest = hashlib.sha1(PIPELINE_VERSION.encode('ascii'))
+        for article in self.articles:
+            digest.update(article.source_hash.encode('ascii'))
+        self.fingerprint = digest.hexdigest()
+        modified = [a.modified_ts for a in self.articles if a.modified_ts is not None]
+        self.last_modified_ts: Optional[float] = max(modified) if modified else None
+        
+        dated = [a for a in self.articles if a.published_ts is not None]
+        self._member = PostingList(dated)
+        self._public = PostingList([a for a in dated if not a.is_member_only])
+        
+        # Tag posting lists, built from the already sorted article list
+        self.tag_names: Dict[str, str] = {}
+        tagged: Dict[str, List[BlogArticle]] = {}
+        for article in dated:
+            for tag in article.tags or []:
+                key = normalize_tag(tag)
+                if not key:
+                    continue
+                self.tag_names.setdefault(key, tag.strip())
+                bucket = tagged.setdefault(key, [])
+                if not bucket or bucket[-1] is not article:
+                    bucket.append(article)
+        self._member_tags = {key: PostingList(items) for key, items in tagged.items()}
+        self._public_tags = {}
+        for key, items in tagged.items():
+            public = [a for a in items if not a.is_member_only]
+            if public:
+                self._public_tags[key] = PostingList(public)
+        # is_member -> (counts, valid until timestamp)
+        self._tag_counts: Dict[bool, Tuple[List[Tuple[str, str, int]], Optional[float]]] = {}
+        self._tag_counts_lock = threading.Lock()
+    
+    @property
+    def member_articles(self) -> List[BlogArticle]:
+        return self._member.articles
+    
+    @property
+    def public_articles(self) -> List[BlogArticle]:
+        return self._public.articles
+    
+    def __len__(self) -> int:
+        return len(self.articles)
+    
+    def get(self, slug: str) -> Optional[BlogArticle]:
+        """Look up an article by slug"""
+        return self.by_slug.get(slug)
+    
+    def _view(self, is_member: bool, tag: Optional[str] = None) -> PostingList:
+        if tag is not None:
+            tags = self._member_tags if is_member else self._public_tags
+            return tags.get(normalize_tag(tag)) or _EMPTY_POSTINGS
+        return self._member if is_member else self._public
+    
+    def count(self, is_member: bool = False, now: Optional[datetime] = None, tag: Optional[str] = None) -> int:
+        """Number of published articles visible to the viewer"""
+        postings = self._view(is_member, tag)
+        return len(postings.articles) - postings.first_visible(now)
+    
+    def published(self, is_member: bool = False, now: Optional[datetime] = None,
+                  tag: Optional[str] = None) -> List[BlogArticle]:
+        """Published articles visible to the viewer, newest first"""
+        postings = self._view(is_member, tag)
+        return postings.articles[postings.first_visible(now):]
     
+    def page(self, page: int, per_page: int, is_member: bool = False,
+             now: Optional[datetime] = None, tag: Optional[str] = None) -> Tuple[List[BlogArticle], int]:
+        """Return one page of published articles and the total visible count"""
+        postings = self._view(is_member, tag)
+        first = postings.first_visible(now)
+        start = first + max(page - 1, 0) * per_page
+        return postings.articles[start:start + per_page], len(postings.articles) - first
+    
+    def paginate(self, page: int, per_page: int, is_member: bool = False, tag: Optional[str] = None,
+                 after: Optional[str] = None, before: Optional[str] = None,
+                 now: Optional[datetime] = None) -> Pagination:
+        """Page of published articles, seeking by keyset cursor when one is given"""
+        postings = self._view(is_member, tag)
+        first = postings.first_visible(now)
+        page = max(page or 1, 1)
+        after_key = _article_cursor(after)
+        before_key = _article_cursor(before)
+        if after_key:
+            start = max(postings.position(*after_key)[1], first)
+        elif before_key:
+            start = max(postings.position(*before_key)[0] - per_page, first)
+        else:
+            start = first + (page - 1) * per_page
+        items = postings.articles[start:start + per_page]
+        
+        def key(article):
+            return encode_cursor([article.published_ts, article.slug])
+        
+        return Pagination(items, page, per_page, len(postings.articles) - first,
+                          next_cursor=key(items[-1]) if items else None,
+                          prev_cursor=key(items[0]) if items else None)
+    
+    def listing_state(self, is_member: bool = False, now: Optional[datetime] = None) -> Tuple[int, Optional[float]]:
+        """(visible article count, last modified timestamp) for the viewer's listing
+        
+        The count moves whenever a scheduled article goes live, and the
+        timestamp covers both file edits and publish times.
+        """
+        postings = self._view(is_member)
+        first = postings.first_visible(now)
+        candidates = [self.last_modified_ts]
+        if first < len(postings.articles):
+            candidates.append(postings.articles[first].published_ts)
+        candidates = [ts for ts in candidates if ts is not None]
+        return len(postings.articles) - first, max(candidates) if candidates else None
+    
+    def tag_counts(self, is_member: bool = False) -> List[Tuple[str, str, int]]:
+        """(key, display name, count) for tags with published articles, most used first
+        
+        Counts are computed once and reused until the next scheduled article
+        in the view goes live.
+        """
+        now_ts = time.time()
+        cached = self._tag_counts.get(is_member)
+        if cached is not None and (cached[1] is None or now_ts < cached[1]):
+            return cached[0]
+        with self._tag_counts_lock:
+            now = datetime.fromtimestamp(now_ts, timezone.utc).replace(tzinfo=None)
+            tags = self._member_tags if is_member else self._public_tags
+            counts = []
+            valid_until = None
+            for key, postings in tags.items():
+                count = len(postings.articles) - postings.first_visible(now)
+                if count:
+                    counts.append((key, self.tag_names[key], count))
+                upcoming = postings.next_publish_ts(now)
+                if upcoming is not None and (valid_until is None or upcoming < valid_until):
+                    valid_until = upcoming
+            counts.sort(key=lambda item: (-item[2], item[0]))
+            self._tag_counts[is_member] = (counts, valid_until)
+            return counts
+
+_EMPTY_POSTINGS = PostingList([])
+
+def _article_cursor(cursor: Optional[str]) -> Optional[Tuple[float, str]]:
+    """Decode a (published_ts, slug) cursor, ignoring malformed ones"""
+    values = decode_cursor(cursor)
+    if (values and len(values) == 2 and isinstance(values[0], (int, float))
+            and not isinstance(values[0], bool) and isinstance(values[1], str)):
+        return float(values[0]), values[1]
+    return None
+
+def normalize_tag(tag: str) -> str:
+    """Canonical lookup key for a tag"""
+    return tag.strip().lower() if isinstance(tag, str) else ''
+
+def _timestamp(value: datetime) -> float:
+    """Epoch seconds for a naive UTC datetime"""
+    return value.replace(tzinfo=timezone.utc).timestamp()
+
+def _list_article_files(blog_dir: Path) -> List[os.DirEntry]:
+    """List article JSON files in the blog directory"""
+    with os.scandir(blog_dir) as entries:
+        # Skip .gitkeep and other non-article files
+        return [e for e in entries
+                if e.name.endswith('.json') and not e.name.startswith('.') and e.is_file()]
+
+def _directory_signature(entries: List[os.DirEntry]) -> Tuple:
+    """Build a cheap fingerprint of the directory from names, mtimes and sizes"""
+    signature = []
+    for entry in entries:
+        try:
+            stat = entry.stat()
+        except OSError:
+            continue
+        signature.append((entry.name, stat.st_mtime_ns, stat.st_size))
+    signature.sort()
+    return tuple(signature)
+
+def _load_json_articles(entries: List[os.DirEntry]) -> List[BlogArticle]:
+    """Parse article JSON files, skipping any that fail to load"""
+    articles = []
+    for entry in entries:
+        try:
+            articles.append(BlogArticle(_read_article_file(entry)))
+        except Exception as e:
+            print(f"Error loading {entry.path}: {e}")
+            continue
     return articles
 
+def build_bundle(blog_dir: Path = BLOG_DIR, bundle_path: Path = BUNDLE_PATH) -> Dict:
+    """Pack the article JSON files into a single memory-mappable bundle"""
+    entries = _list_article_files(blog_dir)
+    signature = _directory_signature(entries)
+    rows = []
+    blob = bytearray()
+    for entry in entries:
+        try:
+            data = _read_article_file(entry)
+        except Exception as e:
+            print(f"Error loading {entry.path}: {e}")
+            continue
+        content = data.pop('content', '') or ''
+        data.update(content_derivatives(content, data.get('excerpt', '')))
+        data['published_ts'] = _parse_timestamp(data.get('published_at'))
+        # Store the finished HTML so workers never run the pipeline
+        rendered = render_content(content)
+        data['toc'] = [list(entry) for entry in rendered.toc]
+        content = str(rendered.html).encode('utf-8')
+        data['offset'] = len(blob)
+        data['length'] = len(content)
+        rows.append(data)
+        blob += content
+    
+    metadata = json.dumps({'signature': signature, 'pipeline': PIPELINE_VERSION, 'articles': rows},
+                          separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+    
+    # Write to a temp file and swap it in so mapped workers keep the old inode
+    tmp_path = bundle_path.with_name(bundle_path.name + '.tmp')
+    with open(tmp_path, 'wb') as f:
+        f.write(_BUNDLE_HEADER.pack(BUNDLE_MAGIC, len(metadata)))
+        f.write(metadata)
+        f.write(blob)
+    os.replace(tmp_path, bundle_path)
+    return {
+        'articles': len(rows),
+        'metadata_bytes': len(metadata),
+        'content_bytes': len(blob),
+        'path': str(bundle_path),
+    }
+
+def _load_bundle(bundle_path: Path, signature: Tuple) -> Optional[List[BlogArticle]]:
+    """Map the bundle and return its articles, or None if missing or stale"""
+    try:
+        with open(bundle_path, 'rb') as f:
+            buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (FileNotFoundError, ValueError):
+        # ValueError: empty file cannot be mapped
+        return None
+    except OSError as e:
+        print(f"Error mapping {bundle_path}: {e}")
+        return None
+    
+    try:
+        magic, metadata_length = _BUNDLE_HEADER.unpack_from(buf, 0)
+        if magic != BUNDLE_MAGIC:
+            buf.close()
+            return None
+        content_start = _BUNDLE_HEADER.size + metadata_length
+        metadata = json.loads(buf[_BUNDLE_HEADER.size:content_start])
+        if (tuple(tuple(item) for item in metadata['signature']) != signature
+                or metadata.get('pipeline') != PIPELINE_VERSION):
+            # JSON files or the content pipeline changed since the bundle was built
+            buf.close()
+            return None
+        return [BlogArticle.from_bundle(meta, buf, content_start) for meta in metadata['articles']]
+    except Exception as e:
+        print(f"Error reading bundle {bundle_path}: {e}")
+        buf.close()
+        return None
+
+class ArticleCache:
+    """Per-worker cache of parsed blog articles
+    
+    Validated against the shared generation counter when it exists, otherwise
+    against the names, mtimes and sizes of the article files.
+    """
+    def __init__(self, blog_dir: Path, bundle_path: Path, generation_path: Path):
+        self.blog_dir = blog_dir
+        self.bundle_path = bundle_path
+        self.counter = GenerationCounter(generation_path)
+        self.from_bundle = False
+        self.index = BlogIndex([])
+        self.signature: Optional[Tuple] = None
+        self.generation: Optional[int] = None
+        # Local version, bumped on every rebuild, for caches derived from the articles
+        self.version = 0
+        self.hits = 0
+        self.misses = 0
+        self.rebuilds = 0
+        self.last_rebuild_seconds = 0.0
+        self.total_rebuild_seconds = 0.0
+        self.last_rebuild_at: Optional[datetime] = None
+        self._lock = threading.Lock()
+        self._dir_checked = False
+    
+    def _article_files(self) -> List[os.DirEntry]:
+        """List article JSON files in the blog directory"""
+        if not self._dir_checked:
+            # Create directory once per worker rather than on every request
+            self.blog_dir.mkdir(parents=True, exist_ok=True)
+            self._dir_checked = True
+        try:
+            return _list_article_files(self.blog_dir)
+        except FileNotFoundError:
+            self._dir_checked = False
+            return []
+    
+    def _rebuild(self, entries: List[os.DirEntry], signature: Tuple) -> BlogIndex:
+        """Load articles from the bundle when current, else parse JSON, and index them"""
+        articles = _load_bundle(self.bundle_path, signature)
+        self.from_bundle = articles is not None
+        if articles is None:
+            articles = _load_json_articles(entries)
+        return BlogIndex(articles)
+    
+    def _is_current(self, generation: Optional[int], signature: Optional[Tuple]) -> bool:
+        if self.signature is None:
+            return False
+        if generation is not None:
+            return generation == self.generation
+        return signature == self.signature
+    
+    def get(self) -> BlogIndex:
+        """Return the cached article index, rebuilding if the content changed"""
+        generation = self.counter.value()
+        entries = signature = None
+        if generation is None:
+            # No shared counter: validate against the directory on every call
+            entries = self._article_files()
+            signature = _directory_signature(entries)
+        if self._is_current(generation, signature):
+            self.hits += 1
+            return self.index
+        
+        with self._lock:
+            # Another thread may have rebuilt while we waited
+            if self._is_current(generation, signature):
+                self.hits += 1
+                return self.index
+            self.misses += 1
+            started = time.perf_counter()
+            if entries is None:
+                entries = self._article_files()
+                signature = _directory_signature(entries)
+            index = self._rebuild(entries, signature)
+            elapsed = time.perf_counter() - started
+            self.index = index
+            self.signature = signature
+            self.generation = generation
+            self.version += 1
+            index.version = self.version
+            self.rebuilds += 1
+            self.last_rebuild_seconds = elapsed
+            self.total_rebuild_seconds += elapsed
+            self.last_rebuild_at = datetime.utcnow()
+            return index
+    
+    def clear(self):
+        """Drop cached articles so the next access rebuilds"""
+        with self._lock:
+            self.index = BlogIndex([])
+            self.signature = None
+            self.generation = None
+    
+    def stats(self) -> Dict:
+        """Return cache counters"""
+        return {
+            'articles': len(self.index),
+            'files': len(self.signature) if self.signature is not None else 0,
+            'from_bundle': self.from_bundle,
+            'shared_generation': self.generation,
+            'version': self.version,
+            'hits': self.hits,
+            'misses': self.misses,
+            'rebuilds': self.rebuilds,
+            'last_rebuild_ms': round(self.last_rebuild_seconds * 1000, 3),
+            'total_rebuild_ms': round(self.total_rebuild_seconds * 1000, 3),
+            'last_rebuild_at': self.last_rebuild_at.isoformat() if self.last_rebuild_at else None,
+        }
+
+_article_cache = ArticleCache(BLOG_DIR, BUNDLE_PATH, GENERATION_PATH)
+
+def get_blog_index() -> BlogIndex:
+    """Get the current article index (cached per worker)
+    
+    Validated once per request: later calls in the same request return the
+    same index, so one page sees one article set and the blog directory is
+    checked only once.
+    """
+    from flask import g, has_request_context
+    if not has_request_context():
+        return _article_cache.get()
+    index = g.get('blog_index')
+    if index is None:
+        index = g.blog_index = _article_cache.get()
+    return index
+
+def load_blog_articles() -> List[BlogArticle]:
+    """Load all blog articles from JSON files (cached per worker)
+    
+    The returned list is shared between requests and must not be modified.
+    """
+    return _article_cache.get().articles
+
+def get_cache_stats() -> Dict:
+    """Get hit/miss/rebuild statistics for the article cache"""
+    return _article_cache.stats()
+
+def clear_article_cache():
+    """Force the next load to re-read all article files"""
+    _article_cache.clear()
+
+def get_content_version() -> int:
+    """Version of the article set this worker is serving, bumped on every rebuild"""
+    return get_blog_index().version
+
+def bump_content_generation() -> int:
+    """Tell every worker to rebuild its article set on its next request"""
+    return _article_cache.counter.bump()
+
+def blog_directory_signature() -> Tuple:
+    """Fingerprint of the article files, for pollers that detect changes"""
+    return _directory_signature(_list_article_files(BLOG_DIR))
+
 def get_article_by_slug(slug: str) -> Optional[BlogArticle]:
     """Get a single article by slug"""
-    articles = load_blog_articles()
-    for article in articles:
-        if article.slug == slug:
-            return article
-    return None
+    return get_blog_index().get(slug)
 
 def get_published_articles(member_only: bool = False) -> List[BlogArticle]:
     """Get published articles, optionally filter by member-only"""
-    articles = load_blog_articles()
-    published = [a for a in articles if a.is_published()]
-    
-    if not member_only:
-        published = [a for a in published if not a.is_member_only]
-    
-    return published
-
+    return get_blog_index().published(is_member=member_only)
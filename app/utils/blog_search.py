@@ -0,0 +1,212 @@
+"""
+Blog search - inverted index with BM25 ranking over the JSON blog articles
+
+Each article's title, excerpt, tags and HTML-stripped content are tokenized
+into per-document term frequencies. Those are persisted next to the blog
+data so a new worker only re-tokenizes articles whose content hash changed.
+Postings and the sorted vocabulary used for prefix matching are rebuilt in
+memory whenever the article index changes.
+"""
+
+import bisect
+import hashlib
+import json
+import math
+import os
+import threading
+from collections import Counter, defaultdict
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from app.utils.blog_loader import BLOG_DIR, BlogArticle, BlogIndex, get_blog_index
+from app.utils.text import strip_html, words
+
+SEARCH_INDEX_PATH = BLOG_DIR.parent / 'blog_search.json'
+SEARCH_INDEX_VERSION = 1
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+# Field weights are applied as repeated term counts
+TITLE_WEIGHT = 3
+TAG_WEIGHT = 2
+EXCERPT_WEIGHT = 1
+CONTENT_WEIGHT = 1
+
+# Prefix matches score lower than exact matches and are capped per query term
+PREFIX_WEIGHT = 0.5
+MAX_PREFIX_EXPANSIONS = 50
+MIN_PREFIX_LENGTH = 2
+
+STOPWORDS = frozenset("""
+a an and are as at be but by for from has have in is it its of on or that the
+this to was were will with you your we our not can
+""".split())
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens with stopwords removed"""
+    return [w for w in words(text) if w not in STOPWORDS]
+
+def _document_hash(article: BlogArticle) -> str:
+    """Hash of the fields that feed the index, without reading the article body"""
+    digest = hashlib.sha1()
+    # source_hash already changes with the content; the body is only read on a mismatch
+    for part in (article.source_hash, article.title, article.excerpt, ' '.join(article.tags or [])):
+        digest.update((part or '').encode('utf-8'))
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+def _document_terms(article: BlogArticle) -> Dict[str, int]:
+    """Weighted term frequencies for one article"""
+    counts = Counter()
+    for term in tokenize(article.title):
+        counts[term] += TITLE_WEIGHT
+    for term in tokenize(' '.join(article.tags or [])):
+        counts[term] += TAG_WEIGHT
+    for term in tokenize(article.excerpt):
+        counts[term] += EXCERPT_WEIGHT
+    for term in tokenize(strip_html(article.content)):
+        counts[term] += CONTENT_WEIGHT
+    return dict(counts)
+
+class SearchIndex:
+    """In-memory inverted index over a set of tokenized documents"""
+    def __init__(self, documents: Dict[str, dict], blog_index: BlogIndex):
+        # documents: slug -> {'hash': str, 'length': int, 'terms': {term: tf}}
+        self.documents = documents
+        self.blog_index = blog_index
+        self.postings: Dict[str, List[Tuple[str, int]]] = defaultdict(list)
+        total_length = 0
+        for slug, doc in documents.items():
+            total_length += doc['length']
+            for term, tf in doc['terms'].items():
+                self.postings[term].append((slug, tf))
+        self.postings = dict(self.postings)
+        self.vocabulary = sorted(self.postings)
+        self.avg_length = total_length / len(documents) if documents else 0.0
+    
+    def _expand(self, term: str) -> List[Tuple[str, float]]:
+        """Exact term plus vocabulary terms it prefixes, with their weights"""
+        matches = []
+        if term in self.postings:
+            matches.append((term, 1.0))
+        if len(term) >= MIN_PREFIX_LENGTH:
+            i = bisect.bisect_right(self.vocabulary, term)
+            while i < len(self.vocabulary) and len(matches) < MAX_PREFIX_EXPANSIONS:
+                candidate = self.vocabulary[i]
+                if not candidate.startswith(term):
+                    break
+                matches.append((candidate, PREFIX_WEIGHT))
+                i += 1
+        return matches
+    
+    def search(self, query: str) -> List[Tuple[str, float]]:
+        """Return (slug, score) pairs ranked by BM25"""
+        n = len(self.documents)
+        if not n:
+            return []
+        scores: Dict[str, float] = defaultdict(float)
+        for query_term in set(tokenize(query)):
+            for term, weight in self._expand(query_term):
+                postings = self.postings[term]
+                idf = math.log(1 + (n - len(postings) + 0.5) / (len(postings) + 0.5))
+                for slug, tf in postings:
+                    length = self.documents[slug]['length']
+                    norm = K1 * (1 - B + B * length / self.avg_length) if self.avg_length else K1
+                    scores[slug] += weight * idf * tf * (K1 + 1) / (tf + norm)
+        return sorted(scores.items(), key=lambda item: item[1], reverse=True)
+
+class SearchIndexCache:
+    """Per-worker search index kept in step with the blog article index"""
+    def __init__(self, path: Path):
+        self.path = path
+        self.index: Optional[SearchIndex] = None
+        self.tokenized = 0
+        self._lock = threading.Lock()
+    
+    def _load_documents(self) -> Dict[str, dict]:
+        """Read persisted per-document term frequencies"""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') != SEARCH_INDEX_VERSION:
+                return {}
+            return data.get('documents', {})
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            print(f"Error loading search index {self.path}: {e}")
+            return {}
+    
+    def _save_documents(self, documents: Dict[str, dict]):
+        """Persist term frequencies atomically so other workers can reuse them"""
+        tmp_path = self.path.with_name(f'{self.path.name}.{os.getpid()}.tmp')
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'version': SEARCH_INDEX_VERSION, 'documents': documents}, f,
+                          separators=(',', ':'), ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"Error saving search index {self.path}: {e}")
+    
+    def _build(self, blog_index: BlogIndex) -> SearchIndex:
+        """Reuse persisted documents whose hash is unchanged, tokenize the rest"""
+        stored = self._load_documents()
+        documents = {}
+        changed = False
+        for slug, article in blog_index.by_slug.items():
+            doc_hash = _document_hash(article)
+            doc = stored.get(slug)
+            if doc is None or doc.get('hash') != doc_hash:
+                terms = _document_terms(article)
+                doc = {'hash': doc_hash, 'length': sum(terms.values()), 'terms': terms}
+                self.tokenized += 1
+                changed = True
+            documents[slug] = doc
+        if changed or len(documents) != len(stored):
+            self._save_documents(documents)
+        return SearchIndex(documents, blog_index)
+    
+    def get(self) -> SearchIndex:
+        """Return the search index for the current article set"""
+        blog_index = get_blog_index()
+        index = self.index
+        if index is not None and index.blog_index is blog_index:
+            return index
+        with self._lock:
+            if self.index is None or self.index.blog_index is not blog_index:
+                self.index = self._build(blog_index)
+            return self.index
+
+_search_cache = SearchIndexCache(SEARCH_INDEX_PATH)
+
+def search_articles(query: str, is_member: bool = False, limit: int = 50) -> List[BlogArticle]:
+    """Search published articles visible to the viewer, best match first"""
+    if not query or not query.strip():
+        return []
+    index = _search_cache.get()
+    results = []
+    for slug, score in index.search(query):
+        article = index.blog_index.get(slug)
+        if article is None or not article.is_published():
+            continue
+        if article.is_member_only and not is_member:
+            continue
+        results.append(article)
+        if len(results) >= limit:
+            break
+    return results
+
+def warm_search_index() -> int:
+    """Build the search index now rather than on the first search; returns its size"""
+    return len(_search_cache.get().documents)
+
+def get_search_stats() -> Dict:
+    """Get size and re-tokenization counters for the search index"""
+    index = _search_cache.index
+    return {
+        'documents': len(index.documents) if index else 0,
+        'terms': len(index.vocabulary) if index else 0,
+        'tokenized': _search_cache.tokenized,
+    }
@@ -0,0 +1,77 @@
+"""
+Startup phase timing
+
+create_app times each phase (config, extensions, each blueprint, templates,
+database check) with a BootTimer. The report is kept on the app, printed by
+`flask boot-report` and included in the detailed health payload.
+"""
+
+import os
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, List, Optional
+
+def process_age_seconds() -> Optional[float]:
+    """Seconds since this process started (Linux /proc), or None if unknown"""
+    try:
+        with open('/proc/self/stat', 'r') as f:
+            # Field 22 is the start time in clock ticks; comm may contain spaces
+            fields = f.read().rsplit(')', 1)[1].split()
+        start_ticks = int(fields[19])
+        with open('/proc/uptime', 'r') as f:
+            uptime = float(f.read().split()[0])
+        return uptime - start_ticks / os.sysconf('SC_CLK_TCK')
+    except (OSError, ValueError, IndexError):
+        return None
+
+class BootTimer:
+    """Records the duration and outcome of each startup phase"""
+    def __init__(self):
+        self.pid = os.getpid()
+        self.started_at = datetime.utcnow()
+        self._started = time.perf_counter()
+        self.phases: List[Dict] = []
+        self.total_ms: Optional[float] = None
+        self.process_age_at_ready: Optional[float] = None
+
+    @contextmanager
+    def phase(self, name: str):
+        """Time a block; an exception escaping it marks the phase failed"""
+        record = {'name': name, 'ms': None, 'ok': True}
+        self.phases.append(record)
+        started = time.perf_counter()
+        try:
+            yield record
+        except Exception as e:
+            record['ok'] = False
+            record['error'] = str(e)
+            raise
+        finally:
+            record['ms'] = round((time.perf_counter() - started) * 1000, 3)
+
+    def fail(self, record: Dict, error):
+        """Mark a phase failed for an error that was handled inside it"""
+        record['ok'] = False
+        record['error'] = str(error)
+
+    def finish(self):
+        self.total_ms = round((time.perf_counter() - self._started) * 1000, 3)
+        self.process_age_at_ready = process_age_seconds()
+
+    def report(self) -> Dict:
+        age = self.process_age_at_ready
+        return {
+            'pid': self.pid,
+            'started_at': self.started_at.isoformat(),
+            'create_app_ms': self.total_ms,
+            # Includes interpreter start-up and imports before create_app
+            'process_ready_ms': round(age * 1000, 1) if age is not None else None,
+            'phases': [dict(record) for record in self.phases],
+        }
+
+def check_database(db):
+    """Open a connection and run a trivial query"""
+    from sqlalchemy import text
+    with db.engine.connect() as connection:
+        connection.execute(text('SELECT 1'))
@@ -0,0 +1,218 @@
+"""
+Response compression middleware
+
+Wraps the WSGI app and gzip- or brotli-encodes HTML, JSON and other text
+responses according to Accept-Encoding. Responses with a known length are
+compressed in one shot when above a size threshold; streamed responses
+(no Content-Length) are compressed chunk by chunk and flushed after each
+chunk, so streamed templates still reach the client incrementally.
+
+Responses that already carry a Content-Encoding (precompressed static
+files, gzip bodies from the response cache), partial content and
+`Cache-Control: no-transform` are passed through untouched. Strong ETags
+get a -gz/-br suffix so each encoding has its own validator.
+"""
+
+import gzip
+import threading
+import zlib
+from typing import Dict, Optional
+
+from werkzeug.datastructures import Headers
+from werkzeug.http import parse_accept_header
+
+DEFAULT_MIMETYPES = (
+    'text/html', 'text/plain', 'text/css', 'text/xml', 'text/javascript',
+    'application/json', 'application/javascript', 'application/xml',
+    'application/rss+xml', 'application/atom+xml', 'image/svg+xml',
+)
+# Statuses whose body must not be re-encoded
+_SKIP_STATUSES = frozenset([204, 206, 304])
+
+ETAG_SUFFIXES = {'gzip': '-gz', 'br': '-br'}
+
+def _brotli():
+    try:
+        import brotli
+    except ImportError:
+        return None
+    return brotli
+
+class _GzipStream:
+    def __init__(self, level: int):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+class _BrotliStream:
+    def __init__(self, brotli, quality: int):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data) + self._compressor.flush()
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+class CompressionMiddleware:
+    """WSGI middleware compressing text responses for clients that accept it"""
+    def __init__(self, app=None):
+        self.enabled = False
+        self.min_size = 500
+        self.gzip_level = 6
+        self.brotli_quality = 4
+        self.mimetypes = frozenset(DEFAULT_MIMETYPES)
+        self.wsgi_app = None
+        self._brotli = None
+        self._lock = threading.Lock()
+        self.compressed = 0
+        self.streamed = 0
+        self.skipped = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Configure from COMPRESS_* settings and wrap app.wsgi_app"""
+        self.enabled = app.config.get('COMPRESS_ENABLED', True)
+        self.min_size = app.config.get('COMPRESS_MIN_SIZE', 500)
+        self.gzip_level = app.config.get('COMPRESS_LEVEL', 6)
+        self.brotli_quality = app.config.get('COMPRESS_BR_QUALITY', 4)
+        self.mimetypes = frozenset(app.config.get('COMPRESS_MIMETYPES', DEFAULT_MIMETYPES))
+        self._brotli = _brotli() if app.config.get('COMPRESS_BROTLI', True) else None
+        app.extensions['compression'] = self
+        if self.enabled:
+            self.wsgi_app = app.wsgi_app
+            app.wsgi_app = self
+
+    def _choose_encoding(self, environ) -> Optional[str]:
+        accept = parse_accept_header(environ.get('HTTP_ACCEPT_ENCODING', ''))
+        if self._brotli is not None and accept['br']:
+            return 'br'
+        if accept['gzip']:
+            return 'gzip'
+        return None
+
+    def _stream(self, encoding: str):
+        if encoding == 'br':
+            return _BrotliStream(self._brotli, self.brotli_quality)
+        return _GzipStream(self.gzip_level)
+
+    def _compress(self, encoding: str, data: bytes) -> bytes:
+        if encoding == 'br':
+            return self._brotli.compress(data, quality=self.brotli_quality)
+        return gzip.compress(data, compresslevel=self.gzip_level)
+
+    def _is_compressible(self, status: int, headers: Headers) -> bool:
+        if status < 200 or status in _SKIP_STATUSES:
+            return False
+        if 'Content-Encoding' in headers:
+            return False
+        mimetype = headers.get('Content-Type', '').split(';', 1)[0].strip().lower()
+        if mimetype not in self.mimetypes:
+            return False
+        return 'no-transform' not in headers.get('Cache-Control', '').lower()
+
+    def _count(self, **deltas):
+        with self._lock:
+            for name, delta in deltas.items():
+                setattr(self, name, getattr(self, name) + delta)
+
+    def __call__(self, environ, start_response):
+        captured = {}
+
+        def capture_start_response(status, headers, exc_info=None):
+            captured['status'] = status
+            captured['headers'] = Headers(headers)
+            captured['exc_info'] = exc_info
+            # Bodies are yielded through us, so no direct writes are expected
+            return lambda data: None
+
+        app_iter = self.wsgi_app(environ, capture_start_response)
+        status = captured['status']
+        headers = captured['headers']
+        status_code = int(status.split(' ', 1)[0])
+
+        if environ.get('REQUEST_METHOD') == 'HEAD' or not self._is_compressible(status_code, headers):
+            start_response(status, headers.to_wsgi_list(), captured['exc_info'])
+            return app_iter
+
+        _add_vary(headers)
+        encoding = self._choose_encoding(environ)
+        content_length = headers.get('Content-Length', type=int)
+        if encoding is None or (content_length is not None and content_length < self.min_size):
+            self._count(skipped=1)
+            start_response(status, headers.to_wsgi_list(), captured['exc_info'])
+            return app_iter
+
+        if content_length is None:
+            # Streamed body: compress incrementally without buffering
+            _mark_encoded(headers, encoding)
+            self._count(streamed=1)
+            start_response(status, headers.to_wsgi_list(), captured['exc_info'])
+            return self._compress_stream(app_iter, encoding)
+
+        try:
+            body = b''.join(app_iter)
+        finally:
+            if hasattr(app_iter, 'close'):
+                app_iter.close()
+        compressed = self._compress(encoding, body)
+        if len(compressed) >= len(body):
+            self._count(skipped=1)
+            start_response(status, headers.to_wsgi_list(), captured['exc_info'])
+            return [body]
+        _mark_encoded(headers, encoding)
+        headers['Content-Length'] = str(len(compressed))
+        self._count(compressed=1, bytes_in=len(body), bytes_out=len(compressed))
+        start_response(status, headers.to_wsgi_list(), captured['exc_info'])
+        return [compressed]
+
+    def _compress_stream(self, app_iter, encoding: str):
+        stream = self._stream(encoding)
+        bytes_in = bytes_out = 0
+        try:
+            for chunk in app_iter:
+                if not chunk:
+                    continue
+                bytes_in += len(chunk)
+                data = stream.compress(chunk)
+                if data:
+                    bytes_out += len(data)
+                    yield data
+            data = stream.finish()
+            bytes_out += len(data)
+            yield data
+        finally:
+            if hasattr(app_iter, 'close'):
+                app_iter.close()
+            self._count(bytes_in=bytes_in, bytes_out=bytes_out)
+
+    def stats(self) -> Dict:
+        return {
+            'enabled': self.enabled,
+            'brotli': self._brotli is not None,
+            'compressed': self.compressed,
+            'streamed': self.streamed,
+            'skipped': self.skipped,
+            'bytes_in': self.bytes_in,
+            'bytes_out': self.bytes_out,
+        }
+
+def _add_vary(headers: Headers):
+    vary = [v.strip() for v in headers.get('Vary', '').split(',') if v.strip()]
+    if not any(v.lower() == 'accept-encoding' for v in vary):
+        vary.append('Accept-Encoding')
+    headers['Vary'] = ', '.join(vary)
+
+def _mark_encoded(headers: Headers, encoding: str):
+    headers['Content-Encoding'] = encoding
+    headers.pop('Content-Length', None)
+    etag = headers.get('ETag')
+    if etag and not etag.startswith('W/') and etag.endswith('"'):
+        headers['ETag'] = etag[:-1] + ETAG_SUFFIXES[encoding] + '"'
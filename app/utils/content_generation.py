@@ -0,0 +1,71 @@
+"""
+Shared content generation counter
+
+A tiny file holding one 64-bit integer that every worker memory-maps. Bumping
+it (via `flask blog reload` or `flask blog watch`) tells all workers to
+rebuild their article set; checking it is a single memory read per request
+instead of a directory walk.
+"""
+
+import mmap
+import os
+import struct
+import threading
+from pathlib import Path
+from typing import Optional
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows development machines
+    fcntl = None
+
+_COUNTER = struct.Struct('<Q')
+
+class GenerationCounter:
+    """Memory-mapped 64-bit counter shared between processes"""
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._map: Optional[mmap.mmap] = None
+        self._lock = threading.Lock()
+    
+    def _open_map(self) -> Optional[mmap.mmap]:
+        """Map the counter file read-only, or return None if it does not exist"""
+        with self._lock:
+            if self._map is None:
+                try:
+                    with open(self.path, 'rb') as f:
+                        self._map = mmap.mmap(f.fileno(), _COUNTER.size, access=mmap.ACCESS_READ)
+                except (FileNotFoundError, ValueError):
+                    # ValueError: file exists but is shorter than the counter
+                    return None
+            return self._map
+    
+    @property
+    def enabled(self) -> bool:
+        """Whether the counter file exists and can be mapped"""
+        return self._map is not None or self._open_map() is not None
+    
+    def value(self) -> Optional[int]:
+        """Current generation, or None when the counter file does not exist"""
+        buf = self._map or self._open_map()
+        if buf is None:
+            return None
+        return _COUNTER.unpack_from(buf, 0)[0]
+    
+    def bump(self) -> int:
+        """Increment the counter in place and return the new generation"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Open without truncating; the file must keep its inode so existing maps see the write
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+            data = os.pread(fd, _COUNTER.size, 0)
+            current = _COUNTER.unpack(data)[0] if len(data) == _COUNTER.size else 0
+            generation = current + 1
+            os.pwrite(fd, _COUNTER.pack(generation), 0)
+            return generation
+        finally:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+            os.close(fd)
@@ -0,0 +1,440 @@
+"""
+Article HTML pipeline - sanitizes and enriches article bodies once
+
+Runs at ingest rather than per request: unsafe tags and attributes are
+dropped, images get lazy loading and intrinsic dimensions, headings get
+anchors and a table of contents is collected. Results are cached in memory
+and on disk keyed by a hash of the source HTML.
+
+The disk cache lives in a directory per PIPELINE_VERSION, so a version bump
+drops the old directory whole. Within it, files unused for
+DISK_CACHE_MAX_AGE_DAYS and the least recently used beyond
+DISK_CACHE_MAX_FILES are pruned every PRUNE_EVERY_WRITES writes, so edited
+articles don't leave their old renderings behind for good. Use is recorded
+in the file's mtime, refreshed at most every TOUCH_INTERVAL_SECONDS, on
+memory hits too, so articles a worker serves from memory aren't pruned.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import time
+import re
+import threading
+from collections import OrderedDict
+from html import escape, unescape
+from html.parser import HTMLParser
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from markupsafe import Markup
+
+# Bump when the transform changes so cached output is regenerated
+PIPELINE_VERSION = '1'
+
+CACHE_DIR = Path(__file__).resolve().parent.parent / 'data' / 'html_cache'
+STATIC_DIR = Path(__file__).resolve().parent.parent / 'static'
+MEMORY_CACHE_SIZE = 256
+DISK_CACHE_MAX_FILES = 2000
+DISK_CACHE_MAX_AGE_DAYS = 30
+PRUNE_EVERY_WRITES = 50
+TOUCH_INTERVAL_SECONDS = 86400
+
+logger = logging.getLogger(__name__)
+
+ALLOWED_TAGS = frozenset("""
+a abbr b blockquote br caption cite code dd del div dl dt em figcaption figure
+h1 h2 h3 h4 h5 h6 hr i img ins kbd li mark ol p pre q s small span strong sub
+sup table tbody td tfoot th thead tr u ul
+""".split())
+VOID_TAGS = frozenset(['br', 'hr', 'img'])
+IMPLIED_END_TAGS = frozenset(['li', 'p', 'dt', 'dd', 'tr', 'td', 'th'])
+# Content of these tags is dropped along with the tag
+DROP_CONTENT_TAGS = frozenset(['script', 'style', 'iframe', 'object', 'embed', 'noscript', 'template', 'svg', 'math'])
+
+GLOBAL_ATTRIBUTES = frozenset(['class', 'id', 'title', 'lang', 'dir'])
+TAG_ATTRIBUTES = {
+    'a': frozenset(['href', 'rel', 'target', 'name']),
+    'img': frozenset(['src', 'alt', 'width', 'height', 'loading', 'decoding', 'srcset', 'sizes']),
+    'td': frozenset(['colspan', 'rowspan']),
+    'th': frozenset(['colspan', 'rowspan', 'scope']),
+    'ol': frozenset(['start', 'reversed', 'type']),
+    'blockquote': frozenset(['cite']),
+    'q': frozenset(['cite']),
+}
+URL_ATTRIBUTES = frozenset(['href', 'src', 'cite'])
+SAFE_URL_SCHEMES = ('http', 'https', 'mailto', 'tel')
+
+# Headings that get anchors and appear in the table of contents
+TOC_LEVELS = frozenset(['h2', 'h3'])
+
+_SCHEME_RE = re.compile(r'^([a-zA-Z][a-zA-Z0-9+.-]*):')
+_CONTROL_RE = re.compile(r'[\x00-\x20]+')
+_SLUG_RE = re.compile(r'[^\w\s-]')
+_SLUG_SPACE_RE = re.compile(r'[-\s]+')
+
+class TocEntry(NamedTuple):
+    level: int
+    anchor: str
+    text: str
+
+class RenderedContent(NamedTuple):
+    html: Markup
+    toc: List[TocEntry]
+
+def _is_safe_url(value: str) -> bool:
+    """Allow relative URLs, fragments and a small set of schemes"""
+    match = _SCHEME_RE.match(_CONTROL_RE.sub('', value))
+    return match is None or match.group(1).lower() in SAFE_URL_SCHEMES
+
+def _slugify(text: str) -> str:
+    slug = _SLUG_RE.sub('', text.lower())
+    return _SLUG_SPACE_RE.sub('-', slug).strip('-') or 'section'
+
+def _static_path(src: str) -> Optional[Path]:
+    """Map an image src under /static (or a bare uploads/ path) to a file"""
+    path = src.split('?', 1)[0].split('#', 1)[0]
+    if path.startswith('/static/'):
+        path = path[len('/static/'):]
+    elif not path.startswith('uploads/'):
+        return None
+    candidate = (STATIC_DIR / path).resolve()
+    try:
+        candidate.relative_to(STATIC_DIR)
+    except ValueError:
+        return None
+    return candidate if candidate.is_file() else None
+
+def _image_size(src: str) -> Optional[Tuple[int, int]]:
+    """Intrinsic size of a local image, read from its header"""
+    path = _static_path(src)
+    if path is None:
+        return None
+    try:
+        from PIL import Image
+    except ImportError:
+        return None
+    try:
+        with Image.open(path) as image:
+            return image.size
+    except Exception:
+        return None
+
+class _ContentTransformer(HTMLParser):
+    """Single pass sanitizer and enricher over an HTML fragment"""
+    def __init__(self):
+        super().__init__(convert_charrefs=False)
+        self.out: List[str] = []
+        self.toc: List[TocEntry] = []
+        self.open_tags: List[str] = []
+        # Tag whose content is being dropped, and its nesting depth
+        self._drop_tag: Optional[str] = None
+        self._drop_depth = 0
+        self._used_ids = set()
+        # Index into self.out of the open heading tag and its collected text
+        self._heading: Optional[Tuple[str, int, List[str], bool]] = None
+
+    def _unique_id(self, base: str) -> str:
+        anchor = base
+        counter = 2
+        while anchor in self._used_ids:
+            anchor = f'{base}-{counter}'
+            counter += 1
+        self._used_ids.add(anchor)
+        return anchor
+
+    def _clean_attrs(self, tag: str, attrs) -> Dict[str, str]:
+        allowed = TAG_ATTRIBUTES.get(tag, frozenset())
+        cleaned = {}
+        for name, value in attrs:
+            name = name.lower()
+            if name not in GLOBAL_ATTRIBUTES and name not in allowed:
+                continue
+            value = value if value is not None else ''
+            if name in URL_ATTRIBUTES and not _is_safe_url(value):
+                continue
+            if name == 'id':
+                value = self._unique_id(value)
+            cleaned[name] = value
+        return cleaned
+
+    def _render_start(self, tag: str, attrs: Dict[str, str]) -> str:
+        parts = [tag] + [f'{name}="{escape(value, quote=True)}"' for name, value in attrs.items()]
+        return '<' + ' '.join(parts) + '>'
+
+    def handle_starttag(self, tag, attrs):
+        if self._drop_tag is not None:
+            if tag == self._drop_tag:
+                self._drop_depth += 1
+            return
+        if tag in DROP_CONTENT_TAGS:
+            self._drop_tag = tag
+            self._drop_depth = 1
+            return
+        if tag not in ALLOWED_TAGS:
+            return
+        if tag in IMPLIED_END_TAGS and self.open_tags and self.open_tags[-1] == tag:
+            # <li>one<li>two: the second item closes the first
+            self.handle_endtag(tag)
+        cleaned = self._clean_attrs(tag, attrs)
+
+        if tag == 'img':
+            cleaned.setdefault('loading', 'lazy')
+            cleaned.setdefault('decoding', 'async')
+            if 'width' not in cleaned and 'height' not in cleaned and cleaned.get('src'):
+                size = _image_size(cleaned['src'])
+                if size:
+                    cleaned['width'], cleaned['height'] = str(size[0]), str(size[1])
+        elif tag == 'a' and cleaned.get('target') == '_blank':
+            cleaned['rel'] = 'noopener noreferrer'
+
+        if tag in TOC_LEVELS and self._heading is None:
+            # Attributes are finalized at the end tag once the text is known
+            self._heading = (tag, len(self.out), [], 'id' in cleaned)
+            self.out.append(cleaned)
+        else:
+            self.out.append(self._render_start(tag, cleaned))
+        if tag not in VOID_TAGS:
+            self.open_tags.append(tag)
+
+    def handle_startendtag(self, tag, attrs):
+        if self._drop_tag is not None or tag in DROP_CONTENT_TAGS:
+            # Self-closing, so there is no content to drop
+            return
+        self.handle_starttag(tag, attrs)
+        if tag not in VOID_TAGS and self.open_tags and self.open_tags[-1] == tag:
+            self.handle_endtag(tag)
+
+    def handle_endtag(self, tag):
+        if self._drop_tag is not None:
+            if tag == self._drop_tag:
+                self._drop_depth -= 1
+                if not self._drop_depth:
+                    self._drop_tag = None
+            return
+        if tag not in ALLOWED_TAGS or tag in VOID_TAGS or tag not in self.open_tags:
+            return
+        # Close any tags left open inside this one
+        while self.open_tags:
+            open_tag = self.open_tags.pop()
+            if open_tag in TOC_LEVELS and self._heading and self._heading[0] == open_tag:
+                self._finish_heading()
+            self.out.append(f'</{open_tag}>')
+            if open_tag == tag:
+                break
+
+    def _finish_heading(self):
+        tag, position, text_parts, has_id = self._heading
+        self._heading = None
+        attrs = self.out[position]
+        text = ' '.join(''.join(text_parts).split())
+        if not has_id:
+            attrs['id'] = self._unique_id(_slugify(text))
+        self.toc.append(TocEntry(int(tag[1]), attrs['id'], text))
+        self.out[position] = self._render_start(tag, attrs)
+
+    def handle_data(self, data):
+        if self._drop_tag is not None:
+            return
+        if self._heading is not None:
+            self._heading[2].append(data)
+        self.out.append(escape(data, quote=False))
+
+    def handle_entityref(self, name):
+        if self._drop_tag is None:
+            text = unescape(f'&{name};')
+            if self._heading is not None:
+                self._heading[2].append(text)
+            self.out.append(escape(text, quote=False))
+
+    def handle_charref(self, name):
+        self.handle_entityref(f'#{name}')
+
+    def close(self):
+        super().close()
+        while self.open_tags:
+            open_tag = self.open_tags.pop()
+            if open_tag in TOC_LEVELS and self._heading and self._heading[0] == open_tag:
+                self._finish_heading()
+            self.out.append(f'</{open_tag}>')
+
+def transform_html(html: str) -> RenderedContent:
+    """Sanitize and enrich an article body (uncached)"""
+    transformer = _ContentTransformer()
+    transformer.feed(html or '')
+    transformer.close()
+    return RenderedContent(Markup(''.join(transformer.out)), transformer.toc)
+
+def content_hash(html: str) -> str:
+    """Cache key for an article body"""
+    digest = hashlib.sha256(PIPELINE_VERSION.encode('ascii'))
+    digest.update((html or '').encode('utf-8'))
+    return digest.hexdigest()
+
+class RenderedContentCache:
+    """LRU of transformed article bodies backed by a shared on-disk cache"""
+    def __init__(self, cache_dir: Path, max_size: int = MEMORY_CACHE_SIZE,
+                 max_files: int = DISK_CACHE_MAX_FILES, max_age_days: float = DISK_CACHE_MAX_AGE_DAYS):
+        self.cache_dir = cache_dir
+        self.version_dir = cache_dir / f'v{PIPELINE_VERSION}'
+        self.max_size = max_size
+        self.max_files = max_files
+        self.max_age_days = max_age_days
+        self._items: 'OrderedDict[str, RenderedContent]' = OrderedDict()
+        # key -> monotonic time its disk file's mtime was last refreshed
+        self._touched: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.pruned = 0
+        self._writes_since_prune = None
+
+    def _read_disk(self, key: str) -> Optional[RenderedContent]:
+        path = self.version_dir / f'{key}.json'
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self._touch(key)
+            return RenderedContent(Markup(data['html']), [TocEntry(*entry) for entry in data['toc']])
+        except FileNotFoundError:
+            return None
+        except Exception:
+            logger.warning("Error reading rendered content cache %s", key, exc_info=True)
+            return None
+
+    def _touch(self, key: str):
+        """Mark the disk file as recently used for pruning"""
+        try:
+            os.utime(self.version_dir / f'{key}.json')
+        except FileNotFoundError:
+            # Pruned or never written: store it again for the other workers
+            rendered = self._items.get(key)
+            if rendered is not None:
+                self._write_disk(key, rendered)
+        except OSError:
+            logger.warning("Error touching rendered content cache %s", key, exc_info=True)
+        self._touched[key] = time.monotonic()
+
+    def _write_disk(self, key: str, rendered: RenderedContent):
+        try:
+            self.version_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.version_dir / f'{key}.{os.getpid()}.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'html': str(rendered.html), 'toc': [list(entry) for entry in rendered.toc]}, f)
+            os.replace(tmp_path, self.version_dir / f'{key}.json')
+            self._touched[key] = time.monotonic()
+        except OSError:
+            logger.warning("Error writing rendered content cache %s", key, exc_info=True)
+            return
+        # Prune on the first write in this process, then every PRUNE_EVERY_WRITES writes
+        if self._writes_since_prune is None or self._writes_since_prune + 1 >= PRUNE_EVERY_WRITES:
+            self._writes_since_prune = 0
+            self.prune()
+        else:
+            self._writes_since_prune += 1
+
+    def prune(self) -> int:
+        """Delete other pipeline versions and stale or excess files; returns the number removed"""
+        removed = 0
+        try:
+            entries = list(os.scandir(self.cache_dir))
+        except FileNotFoundError:
+            return 0
+        except OSError:
+            logger.warning("Error listing rendered content cache %s", self.cache_dir, exc_info=True)
+            return 0
+        for entry in entries:
+            if entry.name == self.version_dir.name:
+                continue
+            try:
+                # Old version directories, and files from before versioned directories
+                if entry.is_dir(follow_symlinks=False):
+                    shutil.rmtree(entry.path)
+                else:
+                    os.unlink(entry.path)
+                removed += 1
+            except FileNotFoundError:
+                pass
+            except OSError:
+                logger.warning("Error pruning rendered content cache %s", entry.path, exc_info=True)
+        files = []
+        try:
+            for entry in os.scandir(self.version_dir):
+                try:
+                    files.append((entry.stat().st_mtime, entry.path))
+                except FileNotFoundError:
+                    pass
+        except FileNotFoundError:
+            pass
+        files.sort(reverse=True)
+        cutoff = time.time() - self.max_age_days * 86400
+        for position, (mtime, path) in enumerate(files):
+            if position < self.max_files and mtime >= cutoff:
+                continue
+            try:
+                os.unlink(path)
+                removed += 1
+            except FileNotFoundError:
+                pass
+            except OSError:
+                logger.warning("Error pruning rendered content cache %s", path, exc_info=True)
+        self.pruned += removed
+        if removed:
+            logger.info("Pruned %d entries from the rendered content cache", removed)
+        return removed
+
+    def get(self, html: str) -> RenderedContent:
+        """Return the transformed body, computing it at most once per content hash"""
+        key = content_hash(html)
+        with self._lock:
+            rendered = self._items.get(key)
+            if rendered is not None:
+                self._items.move_to_end(key)
+                self.hits += 1
+                stale = time.monotonic() - self._touched.get(key, float('-inf')) > TOUCH_INTERVAL_SECONDS
+        if rendered is not None:
+            if stale:
+                self._touch(key)
+            return rendered
+
+        rendered = self._read_disk(key)
+        if rendered is not None:
+            self.disk_hits += 1
+        else:
+            self.misses += 1
+            rendered = transform_html(html)
+            self._write_disk(key, rendered)
+
+        with self._lock:
+            self._items[key] = rendered
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_size:
+                evicted, _ = self._items.popitem(last=False)
+                self._touched.pop(evicted, None)
+        return rendered
+
+    def stats(self) -> Dict:
+        return {
+            'entries': len(self._items),
+            'hits': self.hits,
+            'disk_hits': self.disk_hits,
+            'misses': self.misses,
+            'pruned': self.pruned,
+        }
+
+_rendered_cache = RenderedContentCache(CACHE_DIR)
+
+def render_content(html: str) -> RenderedContent:
+    """Sanitized, enriched article body and table of contents (cached by content hash)"""
+    return _rendered_cache.get(html)
+
+def prune_content_cache() -> int:
+    """Prune the on-disk rendered content cache now"""
+    return _rendered_cache.prune()
+
+def get_content_cache_stats() -> Dict:
+    """Get hit/miss counters for the rendered content cache"""
+    return _rendered_cache.stats()
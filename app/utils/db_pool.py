@@ -0,0 +1,135 @@
+"""
+Database connection pool settings and metrics
+
+configure_engine_options builds SQLALCHEMY_ENGINE_OPTIONS from the DB_*
+settings before Flask-SQLAlchemy creates the engine:
+
+- PostgreSQL: a per-worker QueuePool (DB_POOL_SIZE + DB_MAX_OVERFLOW
+  connections), pre-ping, recycling, and a server-side statement timeout.
+  DB_POOL_TIMEOUT is kept well under the gunicorn timeout, so a starved
+  pool fails the request instead of hanging the worker.
+- PgBouncer in transaction-pooling mode (DB_PGBOUNCER): no pool of our own
+  (NullPool), and no startup parameters, which PgBouncer rejects.
+- SQLite: WAL journal and pragmas suitable for concurrent local load tests.
+
+The pool records how long each checkout waited, plus timeouts, connects
+and invalidations. get_pool_stats reports these counters and the live
+pool sizes for /admin/metrics and the detailed health check.
+"""
+
+import sys
+import threading
+import time
+from typing import Dict
+
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import NullPool, QueuePool
+
+_stats_lock = threading.Lock()
+_pool_stats: Dict = {}
+
+def reset_pool_stats():
+    """Zero the counters (after fork, the worker starts its own)"""
+    with _stats_lock:
+        _pool_stats.update(checkouts=0, wait_total_ms=0.0, wait_max_ms=0.0, slow_checkouts=0,
+                           timeouts=0, connects=0, invalidations=0)
+
+reset_pool_stats()
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records how long callers wait for a connection"""
+    slow_checkout_ms = 100.0
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            with _stats_lock:
+                _pool_stats['timeouts'] += 1
+            print(f"⚠ Database pool exhausted: {self.status()}", file=sys.stderr)
+            raise
+        finally:
+            waited = (time.perf_counter() - started) * 1000
+            with _stats_lock:
+                _pool_stats['checkouts'] += 1
+                _pool_stats['wait_total_ms'] += waited
+                if waited > _pool_stats['wait_max_ms']:
+                    _pool_stats['wait_max_ms'] = waited
+                if waited >= self.slow_checkout_ms:
+                    _pool_stats['slow_checkouts'] += 1
+
+def configure_engine_options(app):
+    """Fill SQLALCHEMY_ENGINE_OPTIONS from the DB_* settings unless set explicitly"""
+    config = app.config
+    if config.get('SQLALCHEMY_ENGINE_OPTIONS'):
+        return config['SQLALCHEMY_ENGINE_OPTIONS']
+    uri = config.get('SQLALCHEMY_DATABASE_URI') or ''
+    if uri.startswith('sqlite'):
+        options = {}
+        if ':memory:' not in uri and uri not in ('sqlite://', 'sqlite:///'):
+            options = {'poolclass': InstrumentedQueuePool,
+                       'connect_args': {'timeout': config['DB_SQLITE_BUSY_TIMEOUT'] / 1000}}
+    elif config.get('DB_PGBOUNCER'):
+        # PgBouncer owns the pool; a connection is returned to it after each transaction
+        options = {'poolclass': NullPool, 'connect_args': {'connect_timeout': config['DB_CONNECT_TIMEOUT']}}
+    else:
+        options = {
+            'poolclass': InstrumentedQueuePool,
+            'pool_size': config['DB_POOL_SIZE'],
+            'max_overflow': config['DB_MAX_OVERFLOW'],
+            'pool_timeout': config['DB_POOL_TIMEOUT'],
+            'pool_recycle': config['DB_POOL_RECYCLE'],
+            'pool_pre_ping': True,
+        }
+        if uri.startswith('postgresql'):
+            connect_args = {'connect_timeout': config['DB_CONNECT_TIMEOUT']}
+            if config['DB_STATEMENT_TIMEOUT_MS']:
+                connect_args['options'] = f"-c statement_timeout={config['DB_STATEMENT_TIMEOUT_MS']}"
+            options['connect_args'] = connect_args
+    InstrumentedQueuePool.slow_checkout_ms = config['DB_POOL_SLOW_MS']
+    config['SQLALCHEMY_ENGINE_OPTIONS'] = options
+    return options
+
+def _count(name):
+    def listener(*args):
+        with _stats_lock:
+            _pool_stats[name] += 1
+    return listener
+
+def instrument_engine(app, db):
+    """Count connects and invalidations, and set SQLite pragmas on new connections"""
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, 'connect', _count('connects'))
+    event.listen(engine, 'invalidate', _count('invalidations'))
+    if engine.dialect.name == 'sqlite' and app.config.get('DB_SQLITE_WAL'):
+        busy_timeout = app.config['DB_SQLITE_BUSY_TIMEOUT']
+
+        @event.listens_for(engine, 'connect')
+        def set_sqlite_pragmas(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            try:
+                cursor.execute('PRAGMA journal_mode=WAL')
+                cursor.execute('PRAGMA synchronous=NORMAL')
+                cursor.execute(f'PRAGMA busy_timeout={int(busy_timeout)}')
+                cursor.execute('PRAGMA temp_store=MEMORY')
+            finally:
+                cursor.close()
+    return engine
+
+def get_pool_stats(db) -> Dict:
+    """Checkout wait counters and live connection counts for this worker"""
+    with _stats_lock:
+        stats = dict(_pool_stats)
+    checkouts = stats['checkouts']
+    stats['wait_avg_ms'] = round(stats['wait_total_ms'] / checkouts, 3) if checkouts else 0.0
+    stats['wait_total_ms'] = round(stats['wait_total_ms'], 3)
+    stats['wait_max_ms'] = round(stats['wait_max_ms'], 3)
+    pool = db.engine.pool
+    stats['pool'] = type(pool).__name__
+    if isinstance(pool, QueuePool):
+        stats.update(size=pool.size(), checked_out=pool.checkedout(), checked_in=pool.checkedin(),
+                     overflow=pool.overflow())
+    return stats
@@ -0,0 +1,187 @@
+"""
+Sitemap and blog feeds served from precomputed bytes
+
+sitemap.xml, the Atom feed and the RSS feed are built from the public view
+of the article index and kept as finished (and gzip-compressed) byte
+strings with an ETag. They are rebuilt only when the article set is
+reloaded or a scheduled article goes live, so polls cost a cache lookup
+and, usually, a 304.
+"""
+
+import gzip
+import hashlib
+import threading
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+from xml.sax.saxutils import escape, quoteattr
+
+from flask import current_app, request, url_for
+
+# Marketing pages listed in the sitemap besides the blog
+SITEMAP_ENDPOINTS = ('main.index', 'main.about', 'main.services', 'main.membership', 'main.contact', 'main.blog')
+
+class XmlDocument(NamedTuple):
+    body: bytes
+    gzipped: bytes
+    etag: str
+    last_modified: Optional[float]
+    mimetype: str
+
+def _utc(timestamp: float) -> datetime:
+    return datetime.fromtimestamp(timestamp, timezone.utc)
+
+def _rfc3339(timestamp: float) -> str:
+    return _utc(timestamp).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+def _article_updated(article) -> float:
+    return max(article.modified_ts or 0, article.published_ts)
+
+def _absolute(site_url: str, endpoint: str, **values) -> str:
+    return site_url + url_for(endpoint, **values)
+
+def build_sitemap(articles: List, site_url: str) -> str:
+    """sitemap.xml for the public pages and articles"""
+    lines = ['<?xml version="1.0" encoding="UTF-8"?>',
+             '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">']
+    for endpoint in SITEMAP_ENDPOINTS:
+        lines.append(f'<url><loc>{escape(_absolute(site_url, endpoint))}</loc></url>')
+    for article in articles:
+        loc = escape(_absolute(site_url, 'main.article', slug=article.slug))
+        lines.append(f'<url><loc>{loc}</loc><lastmod>{_rfc3339(_article_updated(article))}</lastmod></url>')
+    lines.append('</urlset>')
+    return '\n'.join(lines) + '\n'
+
+def build_atom(articles: List, site_url: str, title: str) -> str:
+    """Atom feed of the newest public articles"""
+    feed_url = _absolute(site_url, 'main.blog_feed')
+    updated = max((_article_updated(a) for a in articles), default=0)
+    lines = ['<?xml version="1.0" encoding="UTF-8"?>',
+             '<feed xmlns="http://www.w3.org/2005/Atom">',
+             f'<title>{escape(title)}</title>',
+             f'<id>{escape(feed_url)}</id>',
+             f'<link rel="self" href={quoteattr(feed_url)}/>',
+             f'<link rel="alternate" type="text/html" href={quoteattr(_absolute(site_url, "main.blog"))}/>',
+             f'<updated>{_rfc3339(updated)}</updated>']
+    for article in articles:
+        url = _absolute(site_url, 'main.article', slug=article.slug)
+        lines += ['<entry>',
+                  f'<title>{escape(article.title)}</title>',
+                  f'<id>{escape(url)}</id>',
+                  f'<link rel="alternate" type="text/html" href={quoteattr(url)}/>',
+                  f'<published>{_rfc3339(article.published_ts)}</published>',
+                  f'<updated>{_rfc3339(_article_updated(article))}</updated>',
+                  f'<author><name>{escape(article.author or "")}</name></author>',
+                  f'<summary>{escape(article.excerpt or article.summary)}</summary>']
+        lines += [f'<category term={quoteattr(tag)}/>' for tag in article.tags or []]
+        lines.append('</entry>')
+    lines.append('</feed>')
+    return '\n'.join(lines) + '\n'
+
+def build_rss(articles: List, site_url: str, title: str) -> str:
+    """RSS 2.0 feed of the newest public articles"""
+    blog_url = _absolute(site_url, 'main.blog')
+    lines = ['<?xml version="1.0" encoding="UTF-8"?>',
+             '<rss version="2.0" xmlns:atom="http://www.w3.org/2005/Atom"><channel>',
+             f'<title>{escape(title)}</title>',
+             f'<link>{escape(blog_url)}</link>',
+             f'<description>{escape(title)}</description>',
+             f'<atom:link rel="self" type="application/rss+xml" href={quoteattr(_absolute(site_url, "main.blog_rss"))}/>']
+    if articles:
+        updated = max(_article_updated(a) for a in articles)
+        lines.append(f'<lastBuildDate>{format_datetime(_utc(updated), usegmt=True)}</lastBuildDate>')
+    for article in articles:
+        url = _absolute(site_url, 'main.article', slug=article.slug)
+        lines += ['<item>',
+                  f'<title>{escape(article.title)}</title>',
+                  f'<link>{escape(url)}</link>',
+                  f'<guid isPermaLink="true">{escape(url)}</guid>',
+                  f'<pubDate>{format_datetime(_utc(article.published_ts), usegmt=True)}</pubDate>',
+                  f'<description>{escape(article.excerpt or article.summary)}</description>']
+        lines += [f'<category>{escape(tag)}</category>' for tag in article.tags or []]
+        lines.append('</item>')
+    lines.append('</channel></rss>')
+    return '\n'.join(lines) + '\n'
+
+class XmlDocumentCache:
+    """Finished XML documents, rebuilt when the public article set changes"""
+    def __init__(self):
+        self._documents: Dict[str, Tuple[Tuple, XmlDocument]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.builds = 0
+
+    def get(self, name: str, mimetype: str, build: Callable[[List, str], str], limit: Optional[int] = None) -> XmlDocument:
+        from app.utils.blog_loader import get_blog_index
+        # One validated index fetch per poll; its fingerprint identifies the article sources
+        index = get_blog_index()
+        visible, last_modified = index.listing_state(is_member=False)
+        site_url = current_app.config.get('SITE_URL', '').rstrip('/')
+        key = (index.fingerprint, visible, site_url, limit)
+        cached = self._documents.get(name)
+        if cached is not None and cached[0] == key:
+            self.hits += 1
+            return cached[1]
+        with self._lock:
+            cached = self._documents.get(name)
+            if cached is not None and cached[0] == key:
+                self.hits += 1
+                return cached[1]
+            articles = index.published(is_member=False)
+            if limit is not None:
+                articles = articles[:limit]
+            body = build(articles, site_url).encode('utf-8')
+            document = XmlDocument(body, gzip.compress(body, compresslevel=9),
+                                   hashlib.sha1(body).hexdigest()[:32], last_modified, mimetype)
+            self._documents[name] = (key, document)
+            self.builds += 1
+            return document
+
+    def stats(self) -> Dict:
+        return {
+            'documents': sorted(self._documents),
+            'hits': self.hits,
+            'builds': self.builds,
+        }
+
+_xml_cache = XmlDocumentCache()
+
+def _feed_title() -> str:
+    return current_app.config.get('FEED_TITLE', 'TerraLumen Blog')
+
+def get_sitemap() -> XmlDocument:
+    return _xml_cache.get('sitemap', 'application/xml', build_sitemap)
+
+def get_atom_feed() -> XmlDocument:
+    return _xml_cache.get('atom', 'application/atom+xml',
+                          lambda articles, site_url: build_atom(articles, site_url, _feed_title()),
+                          limit=current_app.config.get('FEED_LENGTH', 20))
+
+def get_rss_feed() -> XmlDocument:
+    return _xml_cache.get('rss', 'application/rss+xml',
+                          lambda articles, site_url: build_rss(articles, site_url, _feed_title()),
+                          limit=current_app.config.get('FEED_LENGTH', 20))
+
+def document_response(document: XmlDocument):
+    """Serve a cached document, answering conditional requests with 304"""
+    from app.utils.http_cache import is_not_modified
+    response = current_app.response_class(mimetype=document.mimetype)
+    accepts_gzip = bool(request.accept_encodings['gzip'])
+    response.set_etag(document.etag + ('-gz' if accepts_gzip else ''))
+    if document.last_modified is not None:
+        response.last_modified = _utc(int(document.last_modified))
+    response.cache_control.public = True
+    response.cache_control.max_age = current_app.config.get('FEED_MAX_AGE', 300)
+    response.vary.add('Accept-Encoding')
+    if is_not_modified(document.etag, document.last_modified):
+        response.status_code = 304
+        return response
+    if accepts_gzip:
+        response.set_data(document.gzipped)
+        response.headers['Content-Encoding'] = 'gzip'
+    else:
+        response.set_data(document.body)
+    return response
+
+def get_feed_stats() -> Dict:
+    return _xml_cache.stats()
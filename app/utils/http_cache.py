@@ -0,0 +1,135 @@
+"""
+Conditional GET helpers for pages built from blog content
+
+Validators are derived from data the article index already holds (source
+file hashes, mtimes, publish times) plus the viewer, so a matching
+If-None-Match or If-Modified-Since is answered with 304 before any template
+is rendered. Pages for logged-in viewers show their name and membership, so
+their ETags cover the user's id and snapshot columns rather than just the
+visibility class.
+"""
+
+import hashlib
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+
+from flask import current_app, request, session
+
+TEMPLATES_DIR = Path(__file__).resolve().parent.parent / 'templates'
+
+# Suffixes added to an ETag when the body is served content-encoded
+ENCODED_ETAG_SUFFIXES = ('-gz', '-br')
+
+_deploy_version: Optional[str] = None
+
+def deploy_version() -> str:
+    """Identifier for the deployed code and templates
+
+    Uses APP_VERSION or Render's RENDER_GIT_COMMIT when set, otherwise the
+    newest template mtime, so a deploy invalidates previously issued ETags.
+    """
+    global _deploy_version
+    if _deploy_version is None:
+        version = os.environ.get('APP_VERSION') or os.environ.get('RENDER_GIT_COMMIT')
+        if not version:
+            newest = 0
+            for root, _dirs, files in os.walk(TEMPLATES_DIR):
+                for name in files:
+                    try:
+                        newest = max(newest, os.stat(os.path.join(root, name)).st_mtime_ns)
+                    except OSError:
+                        continue
+            version = str(newest)
+        _deploy_version = version
+    return _deploy_version
+
+def viewer_class() -> str:
+    """Visibility class the page is rendered for: 'public', 'user' or 'member'"""
+    from flask_login import current_user
+    if not current_user.is_authenticated:
+        return 'public'
+    try:
+        return 'member' if current_user.is_active_member() else 'user'
+    except Exception:
+        return 'user'
+
+def viewer_identity() -> str:
+    """ETag component for the viewer: the class alone for anonymous visitors,
+    otherwise the user id and the columns pages render from the user"""
+    from flask_login import current_user
+    from app.utils.user_cache import SNAPSHOT_FIELDS
+    viewer = viewer_class()
+    if viewer == 'public':
+        return viewer
+    values = [getattr(current_user, field, None) for field in SNAPSHOT_FIELDS]
+    return viewer + ':' + hashlib.sha1(repr(values).encode('utf-8')).hexdigest()
+
+def make_etag(*parts) -> str:
+    """Strong ETag value over the deploy version and the given parts"""
+    digest = hashlib.sha1(deploy_version().encode('utf-8'))
+    for part in parts:
+        digest.update(b'\0')
+        digest.update(str(part).encode('utf-8'))
+    return digest.hexdigest()[:32]
+
+def _http_datetime(timestamp: float) -> datetime:
+    # HTTP dates have one second resolution
+    return datetime.fromtimestamp(int(timestamp), timezone.utc)
+
+def etag_matches(etag: str) -> bool:
+    """Check If-None-Match against an ETag and its content-encoded variants"""
+    if_none_match = request.if_none_match
+    if if_none_match.star_tag:
+        return True
+    return any(if_none_match.contains(etag + suffix) for suffix in ('',) + ENCODED_ETAG_SUFFIXES)
+
+def is_not_modified(etag: Optional[str], last_modified: Optional[float]) -> bool:
+    """Evaluate the request's conditional headers; If-None-Match takes precedence"""
+    if request.method not in ('GET', 'HEAD'):
+        return False
+    if request.if_none_match:
+        return etag is not None and etag_matches(etag)
+    if_modified_since = request.if_modified_since
+    if if_modified_since is not None and last_modified is not None:
+        return _http_datetime(last_modified) <= if_modified_since
+    return False
+
+class Validators:
+    """ETag and Last-Modified for one page, checked before rendering"""
+    def __init__(self, etag: str, last_modified: Optional[float] = None, private: bool = False):
+        self.etag = etag
+        self.last_modified = last_modified
+        self.private = private
+
+    def apply(self, response):
+        """Set the validators and revalidation policy on a response"""
+        response.set_etag(self.etag)
+        if self.last_modified is not None:
+            response.last_modified = _http_datetime(self.last_modified)
+        response.cache_control.no_cache = True
+        if self.private:
+            response.cache_control.private = True
+        response.vary.add('Cookie')
+        return response
+
+    def not_modified(self):
+        """A 304 response if the client's copy is current, else None"""
+        if not is_not_modified(self.etag, self.last_modified):
+            return None
+        return self.apply(current_app.response_class(status=304))
+
+def page_validators(*parts, last_modified: Optional[float] = None) -> Optional[Validators]:
+    """Validators for the current request's page, or None if it must not be validated
+
+    Pages showing flashed messages differ from the cached copy, so they are
+    always rendered in full and carry no validators.
+    """
+    if request.method not in ('GET', 'HEAD') or '_flashes' in session:
+        return None
+    viewer = viewer_identity()
+    public = viewer == 'public'
+    # Last-Modified doesn't identify the user, so logged-in pages revalidate by ETag only
+    return Validators(make_etag(request.full_path, viewer, *parts),
+                      last_modified if public else None, private=not public)
@@ -0,0 +1,155 @@
+"""
+Media endpoint for the hero videos - byte ranges and zero-copy transfer
+
+Videos are served from app/static/video with Range support (206 Partial
+Content), strong ETags and Last-Modified, so seeking and repeat plays only
+fetch the bytes they need. Bodies are handed to the server's
+wsgi.file_wrapper with the file positioned at the range start; gunicorn
+turns that into os.sendfile bounded by Content-Length, and other servers
+read through a bounded reader. Bytes served are counted per file.
+"""
+
+import mimetypes
+import os
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Optional
+
+from flask import abort, current_app, request
+from werkzeug.security import safe_join
+from werkzeug.wsgi import wrap_file
+
+MEDIA_DIR = Path(__file__).resolve().parent.parent / 'static' / 'video'
+CHUNK_SIZE = 64 * 1024
+
+class BoundedFile:
+    """File object that reads at most `length` bytes from its current position
+
+    Keeps fileno() so servers can still use sendfile on the underlying file.
+    """
+    def __init__(self, f, length: int):
+        self._file = f
+        self.remaining = length
+
+    def read(self, size: int = -1) -> bytes:
+        if self.remaining <= 0:
+            return b''
+        if size is None or size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self._file.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def fileno(self) -> int:
+        return self._file.fileno()
+
+    def tell(self) -> int:
+        return self._file.tell()
+
+    def close(self):
+        self._file.close()
+
+class MediaServer:
+    """Serves media files and keeps per-file transfer counters"""
+    def __init__(self, media_dir: Path = MEDIA_DIR):
+        self.media_dir = media_dir
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[str, int]] = {}
+
+    def _count(self, filename: str, status: int, nbytes: int):
+        with self._lock:
+            counters = self._counters.setdefault(filename, {
+                'requests': 0, 'partial': 0, 'not_modified': 0, 'bytes_served': 0})
+            counters['requests'] += 1
+            if status == 206:
+                counters['partial'] += 1
+            elif status == 304:
+                counters['not_modified'] += 1
+            counters['bytes_served'] += nbytes
+
+    def _resolve(self, filename: str) -> Optional[str]:
+        path = safe_join(str(self.media_dir), filename)
+        if path is None or not os.path.isfile(path):
+            return None
+        return path
+
+    def send(self, filename: str):
+        """Response for a media file, honoring Range, If-Range and conditional headers"""
+        path = self._resolve(filename)
+        if path is None:
+            abort(404)
+        stat = os.stat(path)
+        size = stat.st_size
+        etag = f'{stat.st_mtime_ns:x}-{size:x}'
+        last_modified = datetime.fromtimestamp(int(stat.st_mtime), timezone.utc)
+
+        response = current_app.response_class()
+        response.set_etag(etag)
+        response.last_modified = last_modified
+        response.accept_ranges = 'bytes'
+        response.cache_control.public = True
+        response.cache_control.max_age = current_app.config.get('MEDIA_MAX_AGE', 86400)
+        response.mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+
+        if request.if_none_match:
+            not_modified = request.if_none_match.contains(etag) or request.if_none_match.star_tag
+        else:
+            not_modified = request.if_modified_since is not None and last_modified <= request.if_modified_since
+        if not_modified:
+            response.status_code = 304
+            self._count(filename, 304, 0)
+            return response
+
+        start, stop = 0, size
+        byte_range = request.range
+        if byte_range is not None and self._if_range_matches(etag, last_modified):
+            bounds = byte_range.range_for_length(size)
+            if bounds is None:
+                if byte_range.units == 'bytes' and len(byte_range.ranges) == 1:
+                    # Single range that lies outside the file
+                    response.status_code = 416
+                    response.headers['Content-Range'] = f'bytes */{size}'
+                    self._count(filename, 416, 0)
+                    return response
+                # Multiple ranges: send the whole file instead
+            else:
+                start, stop = bounds
+                response.status_code = 206
+                response.content_range = byte_range.make_content_range(size)
+
+        length = stop - start
+        response.content_length = length
+        if request.method == 'HEAD':
+            self._count(filename, response.status_code, 0)
+            return response
+
+        f = open(path, 'rb')
+        f.seek(start)
+        response.response = wrap_file(request.environ, BoundedFile(f, length), CHUNK_SIZE)
+        response.direct_passthrough = True
+        self._count(filename, response.status_code, length)
+        return response
+
+    def _if_range_matches(self, etag: str, last_modified: datetime) -> bool:
+        """A Range is only honored if If-Range (when sent) still matches the file"""
+        if_range = request.if_range
+        if if_range.etag is not None:
+            return if_range.etag == etag
+        if if_range.date is not None:
+            return last_modified <= if_range.date
+        return True
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {name: dict(counters) for name, counters in self._counters.items()}
+
+_media_server = MediaServer()
+
+def send_media(filename: str):
+    """Serve a file from the media directory with byte-range support"""
+    return _media_server.send(filename)
+
+def get_media_stats() -> Dict:
+    """Per-file request and bytes-served counters for this worker"""
+    return _media_server.stats()
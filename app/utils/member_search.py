@@ -0,0 +1,156 @@
+"""
+Admin member directory: search, filters and CSV export
+
+Searching name and email for a substring (`%term%`) can't use a normal
+index. `flask members build-search-index` creates one where the database
+supports it:
+
+- PostgreSQL: pg_trgm GIN indexes on users.name and users.email, which
+  ILIKE '%term%' uses directly.
+- SQLite: an FTS5 table with the trigram tokenizer, kept in sync with the
+  users table by triggers. Searches of three or more characters go through
+  it; shorter ones fall back to a prefix match.
+
+Without the index, searches still work as plain ILIKE scans.
+"""
+
+import csv
+import io
+import time
+from typing import Dict, Iterator, Optional
+
+from sqlalchemy import or_, text
+
+FTS_TABLE = 'users_fts'
+# Trigram indexes can only answer terms of at least three characters
+MIN_INDEXED_TERM = 3
+EXPORT_BATCH_SIZE = 1000
+
+_SQLITE_INDEX_DDL = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+    "name, email, content='users', content_rowid='id', tokenize='trigram')",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON users BEGIN "
+    f"INSERT INTO {FTS_TABLE}(rowid, name, email) VALUES (new.id, new.name, new.email); END",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON users BEGIN "
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, email) VALUES ('delete', old.id, old.name, old.email); END",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF name, email ON users BEGIN "
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, email) VALUES ('delete', old.id, old.name, old.email); "
+    f"INSERT INTO {FTS_TABLE}(rowid, name, email) VALUES (new.id, new.name, new.email); END",
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')",
+)
+
+_POSTGRES_INDEX_DDL = (
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX IF NOT EXISTS ix_users_name_trgm ON users USING gin (name gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS ix_users_email_trgm ON users USING gin (email gin_trgm_ops)",
+)
+
+# Whether the SQLite FTS table exists; a missing table is checked again after a minute
+_fts_state: Dict = {'available': False, 'checked_at': None}
+_FTS_RECHECK_SECONDS = 60
+
+def build_search_index(db) -> str:
+    """Create the substring search index for this database; returns its kind"""
+    dialect = db.engine.dialect.name
+    if dialect == 'sqlite':
+        statements, kind = _SQLITE_INDEX_DDL, 'sqlite fts5 trigram'
+    elif dialect == 'postgresql':
+        statements, kind = _POSTGRES_INDEX_DDL, 'postgresql pg_trgm'
+    else:
+        return 'none'
+    with db.engine.begin() as connection:
+        for statement in statements:
+            connection.execute(text(statement))
+    _fts_state.update(available=dialect == 'sqlite', checked_at=time.monotonic())
+    return kind
+
+def _sqlite_fts_available(db) -> bool:
+    now = time.monotonic()
+    if not _fts_state['available'] and (
+            _fts_state['checked_at'] is None or now - _fts_state['checked_at'] > _FTS_RECHECK_SECONDS):
+        from sqlalchemy import inspect
+        _fts_state.update(available=inspect(db.engine).has_table(FTS_TABLE), checked_at=now)
+    return _fts_state['available']
+
+def _like_escape(term: str) -> str:
+    return term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+def apply_member_search(query, term: Optional[str]):
+    """Restrict a User query to members whose name or email contains term"""
+    from app import db
+    from app.models import User
+    term = (term or '').strip()
+    if not term:
+        return query
+    if len(term) < MIN_INDEXED_TERM:
+        pattern = _like_escape(term) + '%'
+        return query.filter(or_(User.name.ilike(pattern, escape='\\'), User.email.ilike(pattern, escape='\\')))
+    if db.engine.dialect.name == 'sqlite' and _sqlite_fts_available(db):
+        # A quoted phrase matches as a case-insensitive substring with the trigram tokenizer
+        phrase = '"' + term.replace('"', '""') + '"'
+        matches = text(f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH :phrase").bindparams(phrase=phrase)
+        return query.filter(User.id.in_(matches.columns(rowid=db.Integer)))
+    pattern = '%' + _like_escape(term) + '%'
+    return query.filter(or_(User.name.ilike(pattern, escape='\\'), User.email.ilike(pattern, escape='\\')))
+
+def _enum_or_none(enum_class, value):
+    try:
+        return enum_class(value) if value else None
+    except ValueError:
+        return None
+
+def member_filters(args) -> Dict:
+    """Search term and valid status/type filters from request arguments"""
+    from app.models import MembershipStatus, MembershipType
+    status = _enum_or_none(MembershipStatus, args.get('status'))
+    membership_type = _enum_or_none(MembershipType, args.get('type'))
+    return {
+        'q': (args.get('q') or '').strip() or None,
+        'status': status.value if status else None,
+        'type': membership_type.value if membership_type else None,
+    }
+
+def filter_members(query, filters: Dict):
+    """Apply member_filters() output to a User query"""
+    from app.models import User, MembershipStatus, MembershipType
+    query = apply_member_search(query, filters.get('q'))
+    if filters.get('status'):
+        query = query.filter(User.membership_status == MembershipStatus(filters['status']))
+    if filters.get('type'):
+        query = query.filter(User.membership_type == MembershipType(filters['type']))
+    return query
+
+EXPORT_COLUMNS = ('id', 'name', 'email', 'membership_type', 'membership_status',
+                  'stripe_customer_id', 'is_admin', 'created_at')
+
+def _csv_cell(value) -> str:
+    if value is None:
+        return ''
+    if hasattr(value, 'value'):
+        value = value.value
+    elif hasattr(value, 'isoformat'):
+        value = value.isoformat()
+    value = str(value)
+    # Keep spreadsheet apps from evaluating member-supplied text as a formula
+    if value and value[0] in '=+-@\t\r':
+        value = "'" + value
+    return value
+
+def export_members_csv(filters: Dict) -> Iterator[str]:
+    """CSV of the filtered members, yielded in batches without loading the table"""
+    from app import db
+    from app.models import User
+    query = db.session.query(*(getattr(User, column) for column in EXPORT_COLUMNS))
+    query = filter_members(query, filters).order_by(User.id).yield_per(EXPORT_BATCH_SIZE)
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_COLUMNS)
+    rows = 0
+    for row in query:
+        writer.writerow([_csv_cell(value) for value in row])
+        rows += 1
+        if rows % EXPORT_BATCH_SIZE == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
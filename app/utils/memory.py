@@ -0,0 +1,109 @@
+"""
+Process memory reporting
+
+Reads RSS, PSS and USS (unique set size: pages only this process holds)
+from /proc/<pid>/smaps_rollup. With preforked workers, USS is what each
+extra worker really costs and the sum of PSS is what the whole server
+uses. When TRACEMALLOC_FRAMES is set, tracemalloc is started at boot and
+the report includes the top allocation sites of the current process.
+"""
+
+import gc
+import os
+import tracemalloc
+from typing import Dict, List, Optional
+
+_SMAPS_FIELDS = {
+    'Rss': 'rss_kb',
+    'Pss': 'pss_kb',
+    'Shared_Clean': 'shared_clean_kb',
+    'Shared_Dirty': 'shared_dirty_kb',
+    'Private_Clean': 'private_clean_kb',
+    'Private_Dirty': 'private_dirty_kb',
+    'Swap': 'swap_kb',
+}
+
+def process_memory(pid='self') -> Optional[Dict]:
+    """Memory counters in kB for a process (Linux /proc), or None if unreadable"""
+    values = {}
+    try:
+        with open(f'/proc/{pid}/smaps_rollup', 'r') as f:
+            for line in f:
+                name, _, rest = line.partition(':')
+                if name in _SMAPS_FIELDS:
+                    values[_SMAPS_FIELDS[name]] = int(rest.split()[0])
+    except (OSError, ValueError, IndexError):
+        pass
+    if 'rss_kb' not in values:
+        # Older kernels: RSS only
+        try:
+            with open(f'/proc/{pid}/status', 'r') as f:
+                for line in f:
+                    if line.startswith('VmRSS:'):
+                        return {'rss_kb': int(line.split()[1]), 'pss_kb': None, 'uss_kb': None}
+        except (OSError, ValueError, IndexError):
+            pass
+        return None
+    values['uss_kb'] = values.get('private_clean_kb', 0) + values.get('private_dirty_kb', 0)
+    return values
+
+def find_processes(pattern: str) -> List[Dict]:
+    """Processes whose program name contains pattern, with their parent pid"""
+    found = []
+    for entry in os.scandir('/proc'):
+        if not entry.name.isdigit() or int(entry.name) == os.getpid():
+            continue
+        try:
+            with open(f'/proc/{entry.name}/cmdline', 'rb') as f:
+                argv = f.read().decode('utf-8', 'replace').split('\0')
+            with open(f'/proc/{entry.name}/stat', 'r') as f:
+                ppid = int(f.read().rsplit(')', 1)[1].split()[1])
+        except (OSError, ValueError, IndexError):
+            continue
+        # The executable or, for `python path/to/gunicorn`, the script it runs
+        if any(pattern in os.path.basename(arg) for arg in argv[:2]):
+            found.append({'pid': int(entry.name), 'ppid': ppid, 'cmdline': ' '.join(argv).strip()})
+    return found
+
+def start_tracing(frames: int):
+    """Start tracemalloc (a no-op if it is already tracing)"""
+    if frames > 0 and not tracemalloc.is_tracing():
+        tracemalloc.start(frames)
+
+def top_allocations(limit: int = 15) -> Optional[Dict]:
+    """Largest allocation sites still alive in this process, or None when not tracing"""
+    if not tracemalloc.is_tracing():
+        return None
+    snapshot = tracemalloc.take_snapshot().filter_traces((
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+        tracemalloc.Filter(False, '<frozen importlib._bootstrap_external>'),
+    ))
+    current, peak = tracemalloc.get_traced_memory()
+    return {
+        'traced_kb': current // 1024,
+        'peak_kb': peak // 1024,
+        'top': [{
+            'location': f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+            'size_kb': round(stat.size / 1024, 1),
+            'count': stat.count,
+        } for stat in snapshot.statistics('lineno')[:limit]],
+    }
+
+def gc_stats() -> Dict:
+    """Objects frozen before fork and collections run since"""
+    return {
+        'frozen': gc.get_freeze_count(),
+        'counts': list(gc.get_count()),
+        'collections': [generation['collections'] for generation in gc.get_stats()],
+    }
+
+def memory_report(limit: int = 15) -> Dict:
+    """Memory, garbage collector and allocation report for this process"""
+    return {
+        'pid': os.getpid(),
+        'ppid': os.getppid(),
+        'memory': process_memory(),
+        'gc': gc_stats(),
+        'tracemalloc': top_allocations(limit),
+    }
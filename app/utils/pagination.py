@@ -0,0 +1,235 @@
+"""
+Pagination helpers shared by the blog and admin listings
+
+Pages are addressed by an opaque keyset cursor. A cursor encodes the sort
+key of the last (or first) row shown, so following it seeks straight to
+the next page instead of skipping over every earlier row. paginate_query
+also reads the sort keys of the pages around the current one, so the
+numbered links near it seek by cursor too. The first and last pages are
+read from their own end of the index. Only a bare ?page=N in the middle of
+a long listing falls back to an offset.
+
+Totals for the page count are cached per worker for ADMIN_COUNT_CACHE_TTL
+seconds, so paging through a large table doesn't recount it each time.
+"""
+
+import base64
+import json
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import and_, or_
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Encode a sort key as a URL-safe cursor string"""
+    encoded = [{'dt': v.isoformat()} if isinstance(v, datetime) else v for v in values]
+    raw = json.dumps(encoded, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+def decode_cursor(cursor: Optional[str]) -> Optional[List[Any]]:
+    """Decode a cursor produced by encode_cursor, or None if missing or invalid"""
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        values = json.loads(raw)
+        if not isinstance(values, list):
+            return None
+        return [datetime.fromisoformat(v['dt']) if isinstance(v, dict) and 'dt' in v else v for v in values]
+    except Exception:
+        return None
+
+class Pagination:
+    """One page of results with the interface the listing templates use"""
+    def __init__(self, items, page, per_page, total, next_cursor=None, prev_cursor=None, page_cursors=None):
+        self.items = items
+        self.page = page
+        self.per_page = per_page
+        self.total = total
+        self.pages = (total + per_page - 1) // per_page if total > 0 else 1
+        self.has_prev = page > 1
+        self.has_next = page < self.pages
+        self.prev_num = page - 1 if self.has_prev else None
+        self.next_num = page + 1 if self.has_next else None
+        self.next_cursor = next_cursor if self.has_next else None
+        self.prev_cursor = prev_cursor if self.has_prev else None
+        # page number -> ('after' or 'before', cursor) for numbered links that can seek
+        self.page_cursors: Dict[int, Tuple[str, str]] = page_cursors or {}
+
+    @classmethod
+    def empty(cls, per_page=10):
+        """Pagination for a listing with no results"""
+        return cls([], 1, per_page, 0)
+
+    def iter_pages(self, left_edge=1, right_edge=1, left_current=2, right_current=2):
+        """Page numbers to link, with None marking an ellipsis"""
+        if self.pages <= 10:
+            return range(1, self.pages + 1)
+        # For many pages, show first, last, and current area
+        pages = []
+        for i in range(1, min(left_edge + 1, self.pages + 1)):
+            pages.append(i)
+        if left_edge < self.page - left_current - 1:
+            pages.append(None)  # Ellipsis
+        for i in range(max(1, self.page - left_current), min(self.page + right_current + 1, self.pages + 1)):
+            if i not in pages:
+                pages.append(i)
+        if self.page + right_current < self.pages - right_edge:
+            pages.append(None)  # Ellipsis
+        for i in range(max(1, self.pages - right_edge + 1), self.pages + 1):
+            if i not in pages:
+                pages.append(i)
+        return pages
+
+    def page_args(self, page, **extra):
+        """url_for arguments for a numbered page link, seeking by cursor when possible"""
+        args = dict(extra, page=page)
+        if page in self.page_cursors:
+            direction, cursor = self.page_cursors[page]
+            args[direction] = cursor
+        return args
+
+    def next_args(self, **extra):
+        """url_for arguments for the Next link, seeking by cursor when possible"""
+        args = dict(extra, page=self.next_num)
+        if self.next_cursor:
+            args['after'] = self.next_cursor
+        return args
+
+    def prev_args(self, **extra):
+        """url_for arguments for the Previous link, seeking by cursor when possible"""
+        args = dict(extra, page=self.prev_num)
+        if self.prev_cursor:
+            args['before'] = self.prev_cursor
+        return args
+
+_count_lock = threading.Lock()
+_count_cache: Dict[Tuple, Tuple[int, float]] = {}
+_COUNT_CACHE_MAX_ENTRIES = 256
+
+def _count_ttl() -> int:
+    from flask import current_app, has_app_context
+    return current_app.config.get('ADMIN_COUNT_CACHE_TTL', 30) if has_app_context() else 0
+
+def cached_count(query) -> int:
+    """Row count of a query, cached per worker for ADMIN_COUNT_CACHE_TTL seconds"""
+    query = query.order_by(None)
+    ttl = _count_ttl()
+    if not ttl:
+        return query.count()
+    compiled = query.statement.compile()
+    key = (str(compiled), tuple(sorted((name, repr(value)) for name, value in compiled.params.items())))
+    now = time.monotonic()
+    cached = _count_cache.get(key)
+    if cached is not None and cached[1] > now:
+        return cached[0]
+    total = query.count()
+    with _count_lock:
+        if len(_count_cache) >= _COUNT_CACHE_MAX_ENTRIES:
+            _count_cache.clear()
+        _count_cache[key] = (total, now + ttl)
+    return total
+
+def clear_count_cache():
+    with _count_lock:
+        _count_cache.clear()
+
+def _coerce(value, python_type):
+    """value if it is a valid python_type for the column, else None"""
+    if python_type is datetime:
+        return value if isinstance(value, datetime) else None
+    if python_type is int:
+        return value if isinstance(value, int) and not isinstance(value, bool) else None
+    return value if isinstance(value, python_type) else None
+
+def _column_cursor(cursor: Optional[str], sort_column, id_column) -> Optional[Tuple[Any, Any]]:
+    """Decoded (sort value, id) of a cursor, or None unless both match the column types"""
+    values = decode_cursor(cursor)
+    if not values or len(values) != 2:
+        return None
+    key = []
+    for value, column in zip(values, (sort_column, id_column)):
+        try:
+            python_type = column.type.python_type
+        except NotImplementedError:
+            python_type = object
+        value = _coerce(value, python_type)
+        if value is None:
+            return None
+        key.append(value)
+    return tuple(key)
+
+def _older(sort_column, id_column, key):
+    sort_value, id_value = key
+    return or_(sort_column < sort_value, and_(sort_column == sort_value, id_column < id_value))
+
+def _newer(sort_column, id_column, key):
+    sort_value, id_value = key
+    return or_(sort_column > sort_value, and_(sort_column == sort_value, id_column > id_value))
+
+def paginate_query(query, sort_column, id_column, page=1, per_page=20, after=None, before=None, window=2):
+    """Keyset-paginate a query newest first on (sort_column, id_column)
+
+    `after`/`before` are cursors from a previous page's link arguments; an
+    invalid or tampered cursor shows page 1. `window` is how many numbered
+    links on each side of the current page get cursors (the templates show
+    two). The sort column must not be NULL for keyset seeks to be exact.
+    """
+    page = max(page or 1, 1)
+    total = cached_count(query)
+    pages = (total + per_page - 1) // per_page if total > 0 else 1
+    after_key = _column_cursor(after, sort_column, id_column)
+    before_key = _column_cursor(before, sort_column, id_column)
+    newest_first = (sort_column.desc(), id_column.desc())
+    oldest_first = (sort_column.asc(), id_column.asc())
+
+    if (after or before) and not (after_key or before_key):
+        page = 1
+    if after_key:
+        rows = query.filter(_older(sort_column, id_column, after_key)).order_by(
+            *newest_first).limit(per_page).all()
+    elif before_key:
+        rows = query.filter(_newer(sort_column, id_column, before_key)).order_by(
+            *oldest_first).limit(per_page).all()
+        rows.reverse()
+    elif page > 1 and page >= (pages + 1) // 2:
+        # Closer to the end: read the oldest rows backwards (the last page needs no offset)
+        page = min(page, pages)
+        last_page_rows = total - (pages - 1) * per_page
+        if page == pages:
+            rows = query.order_by(*oldest_first).limit(last_page_rows).all()
+        else:
+            rows = query.order_by(*oldest_first).limit(per_page).offset(
+                last_page_rows + (pages - 1 - page) * per_page).all()
+        rows.reverse()
+    else:
+        rows = query.order_by(*newest_first).limit(per_page).offset((page - 1) * per_page).all()
+
+    def key(row):
+        return (getattr(row, sort_column.key), getattr(row, id_column.key))
+
+    page_cursors = {}
+    if rows and window > 1:
+        # Sort keys only, read from the (sort, id) index, for the links around this page
+        keys = query.with_entities(sort_column, id_column).order_by(None)
+        older = keys.filter(_older(sort_column, id_column, key(rows[-1]))).order_by(
+            *newest_first).limit((window - 1) * per_page).all()
+        newer = keys.filter(_newer(sort_column, id_column, key(rows[0]))).order_by(
+            *oldest_first).limit((window - 1) * per_page).all()
+        for step in range(2, window + 1):
+            boundary = (step - 1) * per_page - 1
+            if boundary < len(older):
+                page_cursors[page + step] = ('after', encode_cursor(older[boundary]))
+            if boundary < len(newer) and page - step > 1:
+                page_cursors[page - step] = ('before', encode_cursor(newer[boundary]))
+    if rows:
+        page_cursors[page + 1] = ('after', encode_cursor(key(rows[-1])))
+        if page - 1 > 1:
+            page_cursors[page - 1] = ('before', encode_cursor(key(rows[0])))
+
+    return Pagination(rows, page, per_page, total,
+                      next_cursor=encode_cursor(key(rows[-1])) if rows else None,
+                      prev_cursor=encode_cursor(key(rows[0])) if rows else None,
+                      page_cursors=page_cursors)
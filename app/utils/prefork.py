@@ -0,0 +1,63 @@
+"""
+Copy-on-write friendly preforking
+
+With gunicorn's preload_app the master builds the app once and forks the
+workers from it, so everything loaded before the fork is shared. warm_master
+fills the per-process caches (blog index, rendered articles, search index,
+templates) and imports the modules routes otherwise load on first use, then
+freezes the garbage collector: a collection writes to the header of every
+object it visits, which would copy the shared pages into each worker.
+after_fork runs in each worker and drops state that must not be shared.
+"""
+
+import gc
+import importlib
+import sys
+import time
+from typing import Dict
+
+def warm_master(app) -> Dict:
+    """Load shared state into the master process and freeze it before forking"""
+    from app import db
+    from app.utils.blog_loader import get_blog_index
+    from app.utils.blog_search import warm_search_index
+    from app.utils.template_cache import warm_templates
+    started = time.perf_counter()
+    result = {'articles': 0, 'search_documents': 0, 'templates': 0, 'modules': []}
+    with app.app_context():
+        try:
+            index = get_blog_index()
+            for article in index.by_slug.values():
+                article.html  # renders articles that are not in the bundle
+            result['articles'] = len(index.by_slug)
+            result['search_documents'] = warm_search_index()
+        except Exception as e:
+            print(f"⚠ WARNING: Failed to warm blog caches: {e}", file=sys.stderr)
+        result['templates'] = warm_templates(app)['templates']
+        # Connections opened in the master (e.g. the boot database check) must
+        # not be inherited: two processes would share one socket
+        db.engine.dispose()
+    for name in app.config.get('PRELOAD_MODULES', []):
+        try:
+            importlib.import_module(name)
+            result['modules'].append(name)
+        except ImportError as e:
+            print(f"⚠ WARNING: Failed to preload {name}: {e}", file=sys.stderr)
+    gc.collect()
+    gc.freeze()
+    result['frozen_objects'] = gc.get_freeze_count()
+    result['elapsed_ms'] = round((time.perf_counter() - started) * 1000, 3)
+    return result
+
+def after_fork(app):
+    """Reset per-process state in a freshly forked worker"""
+    import tracemalloc
+    from app import db
+    from app.utils.db_pool import reset_pool_stats
+    with app.app_context():
+        # Forget the master's pool without closing anything it may still hold
+        db.engine.dispose(close=False)
+    reset_pool_stats()
+    if tracemalloc.is_tracing():
+        # Report only what this worker allocates itself
+        tracemalloc.clear_traces()
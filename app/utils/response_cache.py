@@ -0,0 +1,177 @@
+"""
+Full-response cache for anonymous public pages
+
+Rendered pages are stored gzip-compressed in a per-worker LRU keyed on path,
+query string and auth state. Entries expire after a TTL and are dropped when
+the blog content version changes. Logged-in users and requests carrying
+flashed messages always bypass the cache. Cached ETag and Last-Modified
+headers are kept, so hits still answer conditional requests with 304.
+"""
+
+import gzip
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, NamedTuple, Optional, Tuple
+
+from flask import g, request, session
+from werkzeug.http import parse_date, unquote_etag
+
+# Headers that are recomputed when a cached body is served
+_SKIP_HEADERS = frozenset(['content-length', 'content-encoding', 'set-cookie'])
+# Headers repeated on a 304 for a cached response
+_NOT_MODIFIED_HEADERS = frozenset(['etag', 'last-modified', 'cache-control', 'vary'])
+
+class CachedResponse(NamedTuple):
+    status: int
+    headers: Tuple[Tuple[str, str], ...]
+    body: bytes  # gzip-compressed
+    size: int
+    expires_at: float
+    version: int
+
+class ResponseCache:
+    """LRU cache of compressed anonymous responses"""
+    def __init__(self, app=None):
+        self.enabled = False
+        self.ttl = 300
+        self.max_entries = 256
+        self.compress_level = 6
+        self.endpoints = frozenset()
+        self._items: 'OrderedDict[str, CachedResponse]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+        self.bypasses = 0
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Configure from RESPONSE_CACHE_* settings"""
+        self.enabled = app.config.get('RESPONSE_CACHE_ENABLED', True)
+        self.ttl = app.config.get('RESPONSE_CACHE_TTL', 300)
+        self.max_entries = app.config.get('RESPONSE_CACHE_MAX_ENTRIES', 256)
+        self.compress_level = app.config.get('RESPONSE_CACHE_COMPRESS_LEVEL', 6)
+        self.endpoints = frozenset(app.config.get('RESPONSE_CACHE_ENDPOINTS', ()))
+        app.extensions['response_cache'] = self
+
+    def _content_version(self) -> int:
+        from app.utils.blog_loader import get_content_version
+        return get_content_version()
+
+    def _request_key(self) -> Optional[str]:
+        """Cache key for the current request, or None if it must not be cached"""
+        if not self.enabled or request.method not in ('GET', 'HEAD'):
+            return None
+        if request.endpoint not in self.endpoints:
+            return None
+        if '_flashes' in session:
+            self.bypasses += 1
+            return None
+        from flask_login import current_user
+        if current_user.is_authenticated:
+            self.bypasses += 1
+            return None
+        query = '&'.join(sorted(request.query_string.decode('latin-1').split('&'))) if request.query_string else ''
+        return f'anon:{request.path}?{query}'
+
+    def _build_response(self, entry: CachedResponse):
+        from flask import current_app
+        from app.utils.http_cache import is_not_modified
+        accepts_gzip = 'gzip' in request.headers.get('Accept-Encoding', '').lower()
+        headers = dict((k.lower(), v) for k, v in entry.headers)
+        etag = unquote_etag(headers['etag'])[0] if 'etag' in headers else None
+        last_modified = parse_date(headers.get('last-modified'))
+        if (etag or last_modified) and is_not_modified(
+                etag, last_modified.timestamp() if last_modified else None):
+            response = current_app.response_class(status=304, headers=[
+                (k, v) for k, v in entry.headers if k.lower() in _NOT_MODIFIED_HEADERS])
+        else:
+            body = entry.body if accepts_gzip else gzip.decompress(entry.body)
+            response = current_app.response_class(body, status=entry.status, headers=list(entry.headers))
+            if accepts_gzip:
+                response.headers['Content-Encoding'] = 'gzip'
+        if accepts_gzip and etag:
+            # The gzip body is a different representation, so it gets its own tag
+            response.set_etag(etag + '-gz')
+        response.vary.add('Accept-Encoding')
+        response.headers['X-Response-Cache'] = 'HIT'
+        return response
+
+    def lookup(self):
+        """before_request hook: return a cached response or remember the key to store"""
+        key = self._request_key()
+        if key is None:
+            return None
+        # Read once: a page rendered from this article set is stored under this version
+        version = self._content_version()
+        with self._lock:
+            entry = self._items.get(key)
+            if entry is not None and (entry.expires_at <= time.monotonic() or entry.version != version):
+                del self._items[key]
+                entry = None
+            if entry is not None:
+                self._items.move_to_end(key)
+                self.hits += 1
+        if entry is not None:
+            # after_request hooks still run on this response; no key in g keeps store() out
+            return self._build_response(entry)
+        g.response_cache_key = key
+        g.response_cache_version = version
+        self.misses += 1
+        return None
+
+    def store(self, response):
+        """after_request hook: cache successful, cookie-free responses"""
+        key = g.pop('response_cache_key', None)
+        version = g.pop('response_cache_version', None)
+        if key is None or g.get('response_cache_skip'):
+            return response
+        if (response.status_code != 200 or response.is_streamed or response.direct_passthrough
+                or 'Content-Encoding' in response.headers or 'Set-Cookie' in response.headers
+                or session.modified or response.cache_control.no_store or response.cache_control.private):
+            return response
+        data = response.get_data()
+        entry = CachedResponse(
+            status=response.status_code,
+            headers=tuple((k, v) for k, v in response.headers.items() if k.lower() not in _SKIP_HEADERS),
+            body=gzip.compress(data, compresslevel=self.compress_level),
+            size=len(data),
+            expires_at=time.monotonic() + self.ttl,
+            version=version,
+        )
+        with self._lock:
+            self._items[key] = entry
+            self._items.move_to_end(key)
+            self.stores += 1
+            while len(self._items) > self.max_entries:
+                self._items.popitem(last=False)
+                self.evictions += 1
+        response.headers['X-Response-Cache'] = 'MISS'
+        return response
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            stored = sum(len(entry.body) for entry in self._items.values())
+            original = sum(entry.size for entry in self._items.values())
+        return {
+            'enabled': self.enabled,
+            'entries': len(self._items),
+            'compressed_bytes': stored,
+            'uncompressed_bytes': original,
+            'hits': self.hits,
+            'misses': self.misses,
+            'stores': self.stores,
+            'evictions': self.evictions,
+            'bypasses': self.bypasses,
+        }
+
+def skip_response_cache():
+    """Keep the current response out of the cache (e.g. an error fallback page)"""
+    g.response_cache_skip = True
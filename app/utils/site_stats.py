@@ -0,0 +1,171 @@
+"""
+Incrementally maintained dashboard counters
+
+The admin dashboard shows member and article counts. Counting them is a
+full scan that grows with the member base, so the counts live in the
+single-row site_stats table instead. Mapper events on User and Article
+collect +1/-1 deltas on the session, and just before the transaction
+commits they are applied with one UPDATE. The row lock is therefore held
+only for the commit itself rather than from the first write onwards. This
+covers registration, article create/publish/delete and Stripe status
+changes without changes to those handlers.
+
+Until the site_stats table has been migrated the deltas are dropped and
+writes proceed as before. Bulk query.update()/delete() calls bypass mapper
+events; the dashboard recounts from the base tables when the row is older
+than SITE_STATS_MAX_AGE_HOURS, and `flask stats reconcile` does so on
+demand.
+"""
+
+import time
+from datetime import datetime, timedelta
+from typing import Dict
+
+from sqlalchemy import event, inspect
+
+STATS_ROW_ID = 1
+COUNTERS = ('total_members', 'active_members', 'total_articles', 'published_articles')
+SESSION_KEY = 'site_stats_deltas'
+
+_listening = False
+# Whether the site_stats table exists; a missing table is checked again after a minute
+_table_state: Dict = {'available': False, 'checked_at': None}
+_TABLE_RECHECK_SECONDS = 60
+
+def _is_active(status) -> bool:
+    from app.models import MembershipStatus
+    return status == MembershipStatus.ACTIVE
+
+def _table_available(connection) -> bool:
+    now = time.monotonic()
+    if not _table_state['available'] and (
+            _table_state['checked_at'] is None or now - _table_state['checked_at'] > _TABLE_RECHECK_SECONDS):
+        from app.models import SiteStats
+        _table_state.update(available=inspect(connection).has_table(SiteStats.__tablename__), checked_at=now)
+    return _table_state['available']
+
+def _collect(target, **deltas):
+    """Add deltas to the totals pending on the target's session"""
+    from sqlalchemy.orm import object_session
+    session = object_session(target)
+    if session is None:
+        return
+    pending = session.info.setdefault(SESSION_KEY, dict.fromkeys(COUNTERS, 0))
+    for name, delta in deltas.items():
+        pending[name] += delta
+
+def _old_value(target, attribute):
+    """Value of an attribute before the pending change"""
+    history = inspect(target).attrs[attribute].history
+    if history.deleted:
+        return history.deleted[0]
+    return getattr(target, attribute)
+
+def _user_inserted(mapper, connection, target):
+    _collect(target, total_members=1, active_members=int(_is_active(target.membership_status)))
+
+def _user_updated(mapper, connection, target):
+    was_active = _is_active(_old_value(target, 'membership_status'))
+    _collect(target, active_members=int(_is_active(target.membership_status)) - int(was_active))
+
+def _user_deleted(mapper, connection, target):
+    _collect(target, total_members=-1,
+             active_members=-int(_is_active(_old_value(target, 'membership_status'))))
+
+def _article_inserted(mapper, connection, target):
+    _collect(target, total_articles=1, published_articles=int(target.published_at is not None))
+
+def _article_updated(mapper, connection, target):
+    was_published = _old_value(target, 'published_at') is not None
+    _collect(target, published_articles=int(target.published_at is not None) - int(was_published))
+
+def _article_deleted(mapper, connection, target):
+    _collect(target, total_articles=-1,
+             published_articles=-int(_old_value(target, 'published_at') is not None))
+
+def _before_commit(session):
+    """Apply the transaction's deltas with one UPDATE as the last statement"""
+    # Flush first so writes still pending in the session add their deltas
+    session.flush()
+    pending = session.info.pop(SESSION_KEY, None)
+    deltas = {name: delta for name, delta in (pending or {}).items() if delta}
+    if not deltas:
+        return
+    from app.models import SiteStats
+    connection = session.connection()
+    if not _table_available(connection):
+        return
+    table = SiteStats.__table__
+    connection.execute(
+        table.update()
+        .where(table.c.id == STATS_ROW_ID)
+        .values({name: table.c[name] + delta for name, delta in deltas.items()}))
+
+def _after_rollback(session):
+    session.info.pop(SESSION_KEY, None)
+
+def register_stats_listeners():
+    """Attach the counter-maintaining mapper and session events (once per process)"""
+    global _listening
+    if _listening:
+        return
+    from sqlalchemy.orm import Session
+    from app.models import User, Article
+    event.listen(User, 'after_insert', _user_inserted)
+    event.listen(User, 'after_update', _user_updated)
+    event.listen(User, 'after_delete', _user_deleted)
+    event.listen(Article, 'after_insert', _article_inserted)
+    event.listen(Article, 'after_update', _article_updated)
+    event.listen(Article, 'after_delete', _article_deleted)
+    event.listen(Session, 'before_commit', _before_commit)
+    event.listen(Session, 'after_rollback', _after_rollback)
+    _listening = True
+
+def count_site_stats() -> Dict[str, int]:
+    """Exact counts from the base tables (full scans)"""
+    from app import db
+    from app.models import User, Article, MembershipStatus
+    return {
+        'total_members': db.session.query(db.func.count(User.id)).scalar(),
+        'active_members': db.session.query(db.func.count(User.id)).filter(
+            User.membership_status == MembershipStatus.ACTIVE).scalar(),
+        'total_articles': db.session.query(db.func.count(Article.id)).scalar(),
+        'published_articles': db.session.query(db.func.count(Article.id)).filter(
+            Article.published_at.isnot(None)).scalar(),
+    }
+
+def reconcile_site_stats() -> Dict[str, int]:
+    """Recount and store the counters; returns the drift that was corrected"""
+    from app import db
+    from app.models import SiteStats
+    # Lock the row so concurrent deltas wait for the recount (ignored by SQLite)
+    stats = db.session.query(SiteStats).filter_by(id=STATS_ROW_ID).with_for_update().first()
+    if stats is None:
+        stats = SiteStats(id=STATS_ROW_ID)
+        db.session.add(stats)
+    counts = count_site_stats()
+    drift = {name: counts[name] - (getattr(stats, name) or 0) for name in COUNTERS}
+    for name in COUNTERS:
+        setattr(stats, name, counts[name])
+    stats.reconciled_at = datetime.utcnow()
+    db.session.commit()
+    return drift
+
+def get_site_stats():
+    """The counters row, recounted when missing or older than SITE_STATS_MAX_AGE_HOURS"""
+    from flask import current_app
+    from app import db
+    from app.models import SiteStats
+    if not _table_available(db.session.connection()):
+        # Not migrated yet: count directly rather than fail the dashboard
+        return SiteStats(id=STATS_ROW_ID, **count_site_stats())
+    stats = db.session.get(SiteStats, STATS_ROW_ID)
+    max_age = timedelta(hours=current_app.config.get('SITE_STATS_MAX_AGE_HOURS', 24))
+    if stats is None or stats.reconciled_at is None or datetime.utcnow() - stats.reconciled_at > max_age:
+        try:
+            reconcile_site_stats()
+        except Exception:
+            # Another request created the row first
+            db.session.rollback()
+        stats = db.session.get(SiteStats, STATS_ROW_ID)
+    return stats
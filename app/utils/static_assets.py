@@ -0,0 +1,229 @@
+"""
+Fingerprinted, precompressed static assets
+
+`flask assets build` copies files under app/static into app/static/dist with
+a content hash in their names, minifying CSS and JS and writing .gz (and .br
+when the brotli package is installed) variants next to them. A manifest maps
+each original path to its hashed name.
+
+At runtime `url_for('static', filename=...)` emits the hashed URL, and the
+static view serves hashed files with a one year immutable Cache-Control,
+picking the smallest variant the client accepts. Files without a manifest
+entry (uploads, videos, anything edited since the last build) are served by
+Flask's normal static handler.
+"""
+
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import re
+import shutil
+from pathlib import Path
+from typing import Dict, Optional
+
+STATIC_DIR = Path(__file__).resolve().parent.parent / 'static'
+DIST_DIR = STATIC_DIR / 'dist'
+MANIFEST_PATH = DIST_DIR / 'manifest.json'
+
+# Runtime-managed or large media that is not fingerprinted
+SKIP_DIRS = frozenset(['dist', 'uploads', 'video'])
+COMPRESSIBLE_EXTENSIONS = frozenset(['.css', '.js', '.svg', '.json', '.txt', '.xml', '.map', '.ico'])
+# Only keep a compressed variant if it saves at least this fraction
+MIN_SAVING = 0.1
+IMMUTABLE_MAX_AGE = 365 * 24 * 3600
+
+# Preferred order when the client accepts several encodings
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+
+_CSS_COMMENT_RE = re.compile(r'/\*.*?\*/', re.S)
+_CSS_SPACE_RE = re.compile(r'\s+')
+_CSS_PUNCT_RE = re.compile(r'\s*([{};,>])\s*')
+_JS_LINE_COMMENT_RE = re.compile(r'^\s*//.*$')
+
+def minify_css(source: str) -> str:
+    """Strip comments and collapse whitespace around CSS punctuation"""
+    source = _CSS_COMMENT_RE.sub('', source)
+    source = _CSS_SPACE_RE.sub(' ', source)
+    source = _CSS_PUNCT_RE.sub(r'\1', source)
+    return source.replace(';}', '}').strip()
+
+def minify_js(source: str) -> str:
+    """Drop indentation, blank lines and whole-line comments
+
+    Line breaks are kept so automatic semicolon insertion and strings are
+    never affected.
+    """
+    lines = []
+    for line in source.splitlines():
+        if _JS_LINE_COMMENT_RE.match(line):
+            continue
+        line = line.strip()
+        if line:
+            lines.append(line)
+    return '\n'.join(lines) + '\n'
+
+MINIFIERS = {'.css': minify_css, '.js': minify_js}
+
+def _brotli():
+    try:
+        import brotli
+    except ImportError:
+        return None
+    return brotli
+
+def _iter_sources(static_dir: Path):
+    for root, dirs, files in os.walk(static_dir):
+        rel_root = Path(root).relative_to(static_dir)
+        if rel_root == Path('.'):
+            dirs[:] = [d for d in dirs if d not in SKIP_DIRS and not d.startswith('.')]
+        else:
+            dirs[:] = [d for d in dirs if not d.startswith('.')]
+        for name in sorted(files):
+            if not name.startswith('.'):
+                yield Path(root) / name
+
+def build_assets(static_dir: Path = STATIC_DIR, dist_dir: Path = DIST_DIR) -> Dict:
+    """Write hashed, minified and compressed copies of the static files plus a manifest"""
+    brotli = _brotli()
+    if dist_dir.exists():
+        shutil.rmtree(dist_dir)
+    dist_dir.mkdir(parents=True)
+    files = {}
+    original_bytes = written_bytes = 0
+    for source in _iter_sources(static_dir):
+        logical = source.relative_to(static_dir).as_posix()
+        data = source.read_bytes()
+        stat = source.stat()
+        suffix = source.suffix.lower()
+        minifier = MINIFIERS.get(suffix)
+        if minifier is not None:
+            try:
+                data = minifier(data.decode('utf-8')).encode('utf-8')
+            except UnicodeDecodeError:
+                pass
+        digest = hashlib.sha256(data).hexdigest()[:12]
+        hashed = str(Path(logical).with_name(f'{source.stem}.{digest}{source.suffix}').as_posix())
+        target = dist_dir / hashed
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_bytes(data)
+
+        encodings = {}
+        if suffix in COMPRESSIBLE_EXTENSIONS:
+            variants = [('gzip', '.gz', gzip.compress(data, compresslevel=9, mtime=0))]
+            if brotli is not None:
+                variants.append(('br', '.br', brotli.compress(data, quality=11)))
+            for encoding, extension, compressed in variants:
+                if len(compressed) <= len(data) * (1 - MIN_SAVING):
+                    (dist_dir / (hashed + extension)).write_bytes(compressed)
+                    encodings[encoding] = len(compressed)
+        files[logical] = {
+            'path': hashed,
+            'size': len(data),
+            'source_size': stat.st_size,
+            'source_mtime_ns': stat.st_mtime_ns,
+            'encodings': encodings,
+        }
+        original_bytes += stat.st_size
+        written_bytes += min([len(data)] + list(encodings.values()))
+
+    tmp_path = dist_dir / 'manifest.json.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({'files': files}, f, indent=1, sort_keys=True)
+    os.replace(tmp_path, dist_dir / 'manifest.json')
+    return {
+        'files': len(files),
+        'original_bytes': original_bytes,
+        'smallest_bytes': written_bytes,
+        'brotli': brotli is not None,
+        'path': str(dist_dir),
+    }
+
+def load_manifest(manifest_path: Path = MANIFEST_PATH, static_dir: Path = STATIC_DIR) -> Dict[str, dict]:
+    """Manifest entries whose source file is unchanged since the build"""
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            files = json.load(f)['files']
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        print(f"Error reading static manifest {manifest_path}: {e}")
+        return {}
+    current = {}
+    for logical, entry in files.items():
+        try:
+            stat = (static_dir / logical).stat()
+        except OSError:
+            continue
+        if stat.st_size == entry['source_size'] and stat.st_mtime_ns == entry['source_mtime_ns']:
+            current[logical] = entry
+    return current
+
+class StaticAssets:
+    """Serves fingerprinted assets from the build manifest"""
+    def __init__(self, app=None):
+        self.enabled = False
+        self.dist_dir = DIST_DIR
+        self.manifest: Dict[str, dict] = {}
+        # Hashed path -> (logical path, entry)
+        self._by_hashed: Dict[str, tuple] = {}
+        self._send_static = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Load the manifest and take over static URLs when it exists"""
+        self.enabled = app.config.get('STATIC_FINGERPRINT_ENABLED', True)
+        app.extensions['static_assets'] = self
+        if not self.enabled:
+            return
+        self.manifest = load_manifest(self.dist_dir / 'manifest.json')
+        self._by_hashed = {entry['path']: (logical, entry) for logical, entry in self.manifest.items()}
+        if not self.manifest:
+            return
+        self._send_static = app.view_functions['static']
+        app.view_functions['static'] = self.send_static
+        app.url_defaults(self.hashed_url_defaults)
+
+    def hashed_url_defaults(self, endpoint, values):
+        """url_defaults hook: point static URLs at the hashed file name"""
+        if endpoint != 'static':
+            return
+        entry = self.manifest.get(values.get('filename'))
+        if entry is not None:
+            values['filename'] = entry['path']
+
+    def _pick_encoding(self, entry: dict) -> Optional[tuple]:
+        from flask import request
+        accepted = request.accept_encodings
+        for encoding, extension in ENCODINGS:
+            if encoding in entry['encodings'] and accepted[encoding]:
+                return encoding, extension
+        return None
+
+    def send_static(self, filename):
+        """Static view: hashed files get immutable caching and precompressed bodies"""
+        from flask import send_from_directory
+        found = self._by_hashed.get(filename)
+        if found is None:
+            return self._send_static(filename=filename)
+        logical, entry = found
+        mimetype = mimetypes.guess_type(logical)[0] or 'application/octet-stream'
+        encoding = self._pick_encoding(entry)
+        path = entry['path'] + (encoding[1] if encoding else '')
+        response = send_from_directory(self.dist_dir, path, mimetype=mimetype, max_age=IMMUTABLE_MAX_AGE)
+        if encoding:
+            response.headers['Content-Encoding'] = encoding[0]
+        if entry['encodings']:
+            response.vary.add('Accept-Encoding')
+        response.cache_control.public = True
+        response.cache_control.immutable = True
+        return response
+
+    def stats(self) -> Dict:
+        return {
+            'enabled': self.enabled,
+            'files': len(self.manifest),
+            'compressed': sum(1 for entry in self.manifest.values() if entry['encodings']),
+        }
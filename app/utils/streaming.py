@@ -0,0 +1,72 @@
+"""
+Streamed template rendering for long pages
+
+Pages are rendered with Flask's stream_template and sent in chunks of about
+STREAM_CHUNK_SIZE bytes, so the <head> (and its stylesheet link) reaches the
+browser while the rest of the page is still rendering.
+
+A page is rendered in full instead when streaming is disabled, when the
+response cache is about to store it (cached responses must be complete),
+or when flashed messages are pending - rendering them pops them from the
+session, and a streamed response has already sent its session cookie.
+
+Once the first chunk is sent the status and headers can't change, so an
+error later in the page can't reach the view's fallback (an empty listing
+or a redirect). It is logged, and the page is closed with an error notice
+(STREAM_ERROR_FRAGMENT) instead of ending mid-tag.
+"""
+
+import itertools
+from logging import Logger
+from typing import Iterable, Iterator
+
+from flask import current_app, g, make_response, render_template, session, stream_template
+
+def _buffered(chunks: Iterable[str], size: int) -> Iterator[str]:
+    """Join Jinja's many small output strings into chunks of at least `size`"""
+    buffer = []
+    length = 0
+    for chunk in chunks:
+        buffer.append(chunk)
+        length += len(chunk)
+        if length >= size:
+            yield ''.join(buffer)
+            buffer = []
+            length = 0
+    if buffer:
+        yield ''.join(buffer)
+
+STREAM_ERROR_FRAGMENT = ('<div class="flash-messages"><div class="flash-message flash-error">'
+                         'This page could not be loaded completely. Please try again later.'
+                         '</div></div></body></html>')
+
+def _guarded(chunks: Iterator[str], template_name: str, logger: Logger) -> Iterator[str]:
+    """Pass chunks through, ending the page with an error notice if rendering fails"""
+    try:
+        yield from chunks
+    except Exception:
+        logger.exception(f"Error streaming {template_name} after the response started")
+        yield STREAM_ERROR_FRAGMENT
+
+def should_stream() -> bool:
+    """Check whether the current request's page may be streamed"""
+    if not current_app.config.get('STREAM_TEMPLATES', True):
+        return False
+    if '_flashes' in session:
+        return False
+    return g.get('response_cache_key') is None or g.get('response_cache_skip', False)
+
+def stream_page(template_name: str, **context):
+    """Response for a template, streamed when possible
+
+    The first chunk is rendered before returning, so errors in the data the
+    top of the page needs still raise inside the view and can be handled
+    there. Later errors end the page with STREAM_ERROR_FRAGMENT.
+    """
+    if not should_stream():
+        return make_response(render_template(template_name, **context))
+    chunks = _buffered(stream_template(template_name, **context),
+                       current_app.config.get('STREAM_CHUNK_SIZE', 4096))
+    first = next(chunks, '')
+    rest = _guarded(chunks, template_name, current_app.logger)
+    return current_app.response_class(itertools.chain([first], rest), mimetype='text/html')
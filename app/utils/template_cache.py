@@ -0,0 +1,51 @@
+"""
+Jinja bytecode cache and template warm-up
+
+Compiled templates are stored on disk with Jinja's FileSystemBytecodeCache,
+so a new worker loads bytecode instead of recompiling every template. Each
+entry is checked against a hash of the template source, so edited
+templates are recompiled. With TEMPLATE_WARMUP enabled, every template is
+loaded at boot and the time spent is reported.
+"""
+
+import os
+import sys
+import time
+from typing import Dict
+
+from jinja2 import FileSystemBytecodeCache
+
+_warmup_stats: Dict = {'templates': 0, 'errors': 0, 'elapsed_ms': None}
+
+def init_template_cache(app):
+    """Attach the bytecode cache to the app's Jinja environment"""
+    cache_dir = app.config.get('JINJA_BYTECODE_CACHE_DIR')
+    if not cache_dir:
+        return None
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+    except OSError as e:
+        print(f"⚠ WARNING: Jinja bytecode cache disabled, cannot create {cache_dir}: {e}", file=sys.stderr)
+        return None
+    cache = FileSystemBytecodeCache(cache_dir)
+    app.jinja_env.bytecode_cache = cache
+    return cache
+
+def warm_templates(app) -> Dict:
+    """Load every template once so the first requests don't pay for compiling"""
+    started = time.perf_counter()
+    loaded = errors = 0
+    for name in app.jinja_env.list_templates():
+        try:
+            app.jinja_env.get_template(name)
+            loaded += 1
+        except Exception as e:
+            errors += 1
+            print(f"⚠ WARNING: Failed to compile template {name}: {e}", file=sys.stderr)
+    elapsed = (time.perf_counter() - started) * 1000
+    _warmup_stats.update(templates=loaded, errors=errors, elapsed_ms=round(elapsed, 3))
+    return dict(_warmup_stats)
+
+def get_template_stats() -> Dict:
+    """Warm-up results for this worker"""
+    return dict(_warmup_stats)
@@ -0,0 +1,47 @@
+"""
+Text helpers for article content
+"""
+
+import html
+import re
+
+_TAG_RE = re.compile(r'<[^>]+>')
+_WHITESPACE_RE = re.compile(r'\s+')
+_WORD_RE = re.compile(r'[^\W_]+')
+
+def strip_html(value: str) -> str:
+    """Remove HTML tags and entities, collapsing whitespace"""
+    if not value:
+        return ''
+    text = _TAG_RE.sub(' ', value)
+    text = html.unescape(text)
+    return _WHITESPACE_RE.sub(' ', text).strip()
+
+def words(value: str) -> list:
+    """Split plain text into lowercase words"""
+    return _WORD_RE.findall(value.lower()) if value else []
+
+WORDS_PER_MINUTE = 200
+SUMMARY_LENGTH = 200
+META_DESCRIPTION_LENGTH = 160
+
+def truncate_text(text: str, length: int) -> str:
+    """Shorten plain text to at most length characters on a word boundary"""
+    if not text or len(text) <= length:
+        return text or ''
+    # Leave room for the ellipsis
+    cut = text[:length - 3].rsplit(' ', 1)[0] or text[:length - 3]
+    return cut.rstrip(' ,.;:') + '...'
+
+def reading_time(word_count: int) -> int:
+    """Estimate reading time in minutes"""
+    return max(1, round((word_count or 0) / WORDS_PER_MINUTE))
+
+def content_derivatives(content: str, excerpt: str = '') -> dict:
+    """Listing and SEO values derived from an article body, computed once at ingest"""
+    plain = strip_html(content)
+    return {
+        'summary': truncate_text(plain, SUMMARY_LENGTH),
+        'word_count': len(plain.split()),
+        'meta_description': truncate_text(strip_html(excerpt) or plain, META_DESCRIPTION_LENGTH),
+    }
@@ -0,0 +1,177 @@
+"""
+Cached user loader for Flask-Login
+
+Every page checks current_user, so loading the User row per request costs a
+database round trip even on marketing pages. The loader instead returns a
+UserSnapshot: a plain copy of the columns pages read, kept per worker for
+USER_CACHE_TTL seconds.
+
+Entries are invalidated when a User row is updated or deleted: mapper
+events note which users changed, and once the session commits their
+entries are dropped and the shared user generation counter is bumped, so
+the other workers drop their snapshots too. Code that modifies the current
+user must load the real row first (current_user_model).
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, NamedTuple, Optional
+
+from flask_login import UserMixin
+
+from app.utils.content_generation import GenerationCounter
+
+USER_GENERATION_PATH = Path(os.environ.get('USER_GENERATION_FILE') or
+                            Path(__file__).resolve().parent.parent / 'data' / 'user.generation')
+
+# Columns copied into the snapshot; changes to other columns keep cached entries
+SNAPSHOT_FIELDS = ('id', 'email', 'name', 'membership_type', 'membership_status',
+                   'stripe_customer_id', 'stripe_subscription_id', 'is_admin', 'created_at')
+
+class UserSnapshot(UserMixin):
+    """Read-only copy of a user's columns, safe to share between requests"""
+    __slots__ = SNAPSHOT_FIELDS
+
+    def __init__(self, user):
+        for field in SNAPSHOT_FIELDS:
+            object.__setattr__(self, field, getattr(user, field))
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"UserSnapshot is read-only; load the User row to change {name!r}")
+
+    def is_active_member(self):
+        """Check if user has active membership"""
+        from app.models import MembershipStatus
+        return self.membership_status == MembershipStatus.ACTIVE
+
+    def __repr__(self):
+        return f'<UserSnapshot {self.email}>'
+
+class CachedUser(NamedTuple):
+    snapshot: UserSnapshot
+    expires_at: float
+    generation: Optional[int]
+
+class UserCache:
+    """Per-worker TTL cache of user snapshots keyed on user id"""
+    def __init__(self, app=None):
+        self.enabled = False
+        self.ttl = 60
+        self.max_entries = 1024
+        self.counter = GenerationCounter(USER_GENERATION_PATH)
+        self._items: 'OrderedDict[int, CachedUser]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._listening = False
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Configure from USER_CACHE_* settings and watch User changes"""
+        self.enabled = app.config.get('USER_CACHE_ENABLED', True)
+        self.ttl = app.config.get('USER_CACHE_TTL', 60)
+        self.max_entries = app.config.get('USER_CACHE_MAX_ENTRIES', 1024)
+        app.extensions['user_cache'] = self
+        self._listen()
+
+    def _listen(self):
+        if self._listening:
+            return
+        from sqlalchemy import event
+        from sqlalchemy.orm import Session
+        from app.models import User
+        event.listen(User, 'after_update', self._user_updated)
+        event.listen(User, 'after_delete', self._user_deleted)
+        event.listen(Session, 'after_commit', self._after_commit)
+        event.listen(Session, 'after_rollback', self._after_rollback)
+        self._listening = True
+
+    def _note_change(self, target):
+        from sqlalchemy.orm import object_session
+        session = object_session(target)
+        if session is not None:
+            session.info.setdefault('changed_users', set()).add(target.id)
+
+    def _user_updated(self, mapper, connection, target):
+        from sqlalchemy import inspect
+        state = inspect(target)
+        if any(state.attrs[field].history.has_changes() for field in SNAPSHOT_FIELDS):
+            self._note_change(target)
+
+    def _user_deleted(self, mapper, connection, target):
+        self._note_change(target)
+
+    def _after_rollback(self, session):
+        session.info.pop('changed_users', None)
+
+    def _after_commit(self, session):
+        user_ids = session.info.pop('changed_users', None)
+        if user_ids:
+            self.invalidate(*user_ids)
+
+    def invalidate(self, *user_ids: int):
+        """Drop cached snapshots here and tell the other workers to drop theirs"""
+        with self._lock:
+            for user_id in user_ids:
+                self._items.pop(user_id, None)
+            self.invalidations += len(user_ids)
+        try:
+            self.counter.bump()
+        except OSError as e:
+            print(f"Error bumping user generation {self.counter.path}: {e}")
+
+    def load(self, user_id: int):
+        """Snapshot for a user id from the cache or the database; None if missing"""
+        from app.models import User
+        from app import db
+        if not self.enabled:
+            return db.session.get(User, user_id)
+        generation = self.counter.value()
+        now = time.monotonic()
+        entry = self._items.get(user_id)
+        if entry is not None and entry.expires_at > now and entry.generation == generation:
+            self.hits += 1
+            return entry.snapshot
+        self.misses += 1
+        user = db.session.get(User, user_id)
+        if user is None:
+            return None
+        snapshot = UserSnapshot(user)
+        with self._lock:
+            self._items[user_id] = CachedUser(snapshot, now + self.ttl, generation)
+            self._items.move_to_end(user_id)
+            while len(self._items) > self.max_entries:
+                self._items.popitem(last=False)
+        return snapshot
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+    def stats(self) -> Dict:
+        total = self.hits + self.misses
+        return {
+            'enabled': self.enabled,
+            'entries': len(self._items),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / total, 3) if total else 0.0,
+            'invalidations': self.invalidations,
+            'shared_generation': self.counter.value(),
+        }
+
+def current_user_model():
+    """The logged-in user's User row, for code that modifies it"""
+    from flask_login import current_user
+    from app.models import User
+    from app import db
+    if not current_user.is_authenticated:
+        return None
+    if isinstance(current_user._get_current_object(), User):
+        return current_user._get_current_object()
+    return db.session.get(User, current_user.id)
@@ -0,0 +1,130 @@
+"""
+Benchmark: admin dashboard latency as the member base grows
+
+Fills a temporary SQLite database with synthetic members and articles in
+steps, and at each size times the dashboard's statistics queries done the
+old way (four COUNT scans plus the two recent lists) and the current way
+(the site_stats row plus the two lists), and a full GET /admin/.
+
+Usage:
+    python benchmarks/bench_admin_dashboard.py [--sizes 1000,10000,100000] [--runs 20]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+def add_rows(db, start, stop, author_id):
+    """Insert members start..stop-1 and one article per 50 members (bypasses the ORM)"""
+    from app.models import User, Article, MembershipStatus, MembershipType
+    base = datetime(2020, 1, 1)
+    statuses = [MembershipStatus.ACTIVE, MembershipStatus.INACTIVE, MembershipStatus.PENDING]
+    for offset in range(start, stop, 10000):
+        end = min(offset + 10000, stop)
+        db.session.execute(User.__table__.insert(), [{
+            'email': f'member{i}@example.org',
+            'password_hash': 'x',
+            'name': f'Member {i}',
+            'membership_type': MembershipType.ANNUAL,
+            'membership_status': statuses[i % 3],
+            'is_admin': False,
+            'created_at': base + timedelta(minutes=i),
+            'updated_at': base + timedelta(minutes=i),
+        } for i in range(offset, end)])
+    articles = [{
+        'title': f'Article {i}',
+        'slug': f'article-{i}',
+        'content': '<p>Benchmark article.</p>',
+        'is_member_only': False,
+        'author_id': author_id,
+        'published_at': base + timedelta(hours=i) if i % 2 else None,
+        'created_at': base + timedelta(hours=i),
+        'updated_at': base + timedelta(hours=i),
+    } for i in range(start // 50, stop // 50)]
+    if articles:
+        db.session.execute(Article.__table__.insert(), articles)
+    db.session.commit()
+
+def legacy_queries():
+    """The dashboard queries before site_stats"""
+    from app.models import User, Article, MembershipStatus
+    User.query.count()
+    User.query.filter_by(membership_status=MembershipStatus.ACTIVE).count()
+    Article.query.count()
+    Article.query.filter(Article.published_at.isnot(None)).count()
+    User.query.order_by(User.created_at.desc()).limit(5).all()
+    recent = Article.query.order_by(Article.created_at.desc()).limit(5).all()
+    [article.author.name for article in recent]
+
+def current_queries():
+    """The dashboard queries as admin.index runs them now"""
+    from app import db
+    from app.models import User, Article
+    from app.utils.site_stats import get_site_stats
+    get_site_stats()
+    User.query.order_by(User.created_at.desc(), User.id.desc()).limit(5).all()
+    recent = Article.query.options(db.defer(Article.content), db.joinedload(Article.author)).order_by(
+        Article.created_at.desc(), Article.id.desc()).limit(5).all()
+    [article.author.name for article in recent]
+
+def median_ms(fn, runs):
+    from app import db
+    samples = []
+    for _ in range(runs):
+        db.session.expire_all()
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', default='1000,10000,100000')
+    parser.add_argument('--runs', type=int, default=20)
+    args = parser.parse_args()
+    sizes = sorted(int(size) for size in args.sizes.split(','))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ['DATABASE_URL'] = f'sqlite:///{tmp}/bench.db'
+        os.environ['JINJA_BYTECODE_CACHE_DIR'] = ''
+        from app import create_app, db
+        from app.models import User
+        from app.utils.site_stats import reconcile_site_stats
+
+        app = create_app()
+        app.config['WTF_CSRF_ENABLED'] = False
+        with app.app_context():
+            db.create_all()
+            admin = User(email='admin@example.org', name='Admin', is_admin=True)
+            admin.set_password('benchmark')
+            db.session.add(admin)
+            db.session.commit()
+            admin_id = admin.id
+        client = app.test_client()
+        client.post('/auth/login', data={'email': 'admin@example.org', 'password': 'benchmark'})
+
+        print(f"{'members':>9} {'old queries ms':>15} {'new queries ms':>15} {'GET /admin/ ms':>15}")
+        filled = 0
+        for size in sizes:
+            with app.app_context():
+                add_rows(db, filled, size, admin_id)
+                filled = size
+                # Bulk inserts skip the mapper events, exactly what reconcile repairs
+                reconcile_site_stats()
+                old = median_ms(legacy_queries, args.runs)
+                new = median_ms(current_queries, args.runs)
+            samples = []
+            for _ in range(args.runs):
+                started = time.perf_counter()
+                client.get('/admin/')
+                samples.append((time.perf_counter() - started) * 1000)
+            print(f"{size:>9} {old:15.2f} {new:15.2f} {statistics.median(samples):15.2f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,117 @@
+"""
+Benchmark: blog article memory footprint and load time
+
+Generates a synthetic corpus of article JSON files and compares the original
+dict-backed article class with the slotted BlogArticle, for both JSON parsing
+and the memory-mapped bundle.
+
+Usage:
+    python benchmarks/bench_blog_articles.py [--articles 10000]
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.utils import blog_loader  # noqa: E402
+
+class LegacyBlogArticle:
+    """The dict-backed article class blog_loader used before __slots__"""
+    def __init__(self, data):
+        self.id = data.get('id')
+        self.title = data.get('title', '')
+        self.slug = data.get('slug', '')
+        self.content = data.get('content', '')
+        self.excerpt = data.get('excerpt', '')
+        self.author = data.get('author', 'TerraLumen Team')
+        self.published_at = data.get('published_at')
+        self.is_member_only = data.get('is_member_only', False)
+        self.tags = data.get('tags', [])
+        self.featured_image = data.get('featured_image', '')
+        if isinstance(self.published_at, str):
+            date_str = self.published_at.replace('Z', '+00:00')
+            self.published_at = datetime.fromisoformat(date_str)
+            if self.published_at.tzinfo is not None:
+                self.published_at = self.published_at.astimezone(timezone.utc).replace(tzinfo=None)
+
+def write_corpus(blog_dir, count):
+    """Write count synthetic article files"""
+    start = datetime(2020, 1, 1, tzinfo=timezone.utc)
+    paragraph = '<p>' + ' '.join(['healing plasma consciousness sovereignty'] * 40) + '</p>'
+    for i in range(count):
+        data = {
+            'id': i,
+            'title': f'Synthetic article {i}',
+            'slug': f'synthetic-article-{i}',
+            'excerpt': f'Excerpt for synthetic article {i}.',
+            'content': f'<h2>Article {i}</h2>' + paragraph * 8,
+            'author': 'TerraLumen Team',
+            'published_at': (start + timedelta(hours=i)).isoformat().replace('+00:00', 'Z'),
+            'is_member_only': i % 4 == 0,
+            'tags': ['plasma', f'topic-{i % 25}'],
+            'featured_image': '',
+        }
+        with open(blog_dir / f'article-{i:05d}.json', 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+
+def measure(label, loader):
+    """Time loader, then run it again under tracemalloc to report retained memory"""
+    started = time.perf_counter()
+    loader()
+    elapsed = time.perf_counter() - started
+    tracemalloc.start()
+    articles = loader()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    count = len(articles)
+    print(f"{label:<28} {elapsed * 1000:9.1f} ms  {current / 1024 / 1024:8.2f} MiB retained  "
+          f"{current / count:8.0f} B/article  {peak / 1024 / 1024:8.2f} MiB peak")
+    return articles
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--articles', type=int, default=10000)
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        blog_dir = Path(tmp) / 'blog'
+        blog_dir.mkdir()
+        bundle_path = Path(tmp) / 'blog.bundle'
+        print(f"Writing {args.articles} synthetic articles...")
+        write_corpus(blog_dir, args.articles)
+        entries = blog_loader._list_article_files(blog_dir)
+        signature = blog_loader._directory_signature(entries)
+        
+        def load_legacy():
+            articles = []
+            for entry in entries:
+                with open(entry.path, 'r', encoding='utf-8') as f:
+                    articles.append(LegacyBlogArticle(json.load(f)))
+            return articles
+        
+        def load_bundle():
+            return blog_loader._load_bundle(bundle_path, signature)
+        
+        measure('legacy dict articles (JSON)', load_legacy)
+        measure('slotted articles (JSON)', lambda: blog_loader._load_json_articles(entries))
+        blog_loader.build_bundle(blog_dir, bundle_path)
+        articles = measure('slotted articles (bundle)', load_bundle)
+        
+        started = time.perf_counter()
+        index = blog_loader.BlogIndex(articles)
+        print(f"{'index build':<28} {(time.perf_counter() - started) * 1000:9.1f} ms")
+        started = time.perf_counter()
+        for page in range(1, 101):
+            index.page(page, 10, is_member=False)
+        print(f"{'100 listing pages':<28} {(time.perf_counter() - started) * 1000:9.1f} ms")
+
+if __name__ == '__main__':
+    main()
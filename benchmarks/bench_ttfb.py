@@ -0,0 +1,90 @@
+"""
+Benchmark: time to first byte for a long article, buffered vs streamed
+
+Writes one very long synthetic article to a temporary blog directory and
+requests it through the full WSGI stack (including compression) with
+template streaming off and on. TTFB is the time until the first body chunk
+comes out of the WSGI iterable; total is the time to drain it.
+
+Usage:
+    python benchmarks/bench_ttfb.py [--paragraphs 3000] [--runs 20]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+def write_article(blog_dir, paragraphs):
+    """Write one long article with a heading every 20 paragraphs"""
+    paragraph = '<p>' + ' '.join(['healing plasma consciousness sovereignty'] * 30) + '</p>'
+    parts = []
+    for i in range(paragraphs):
+        if i % 20 == 0:
+            parts.append(f'<h2>Section {i // 20 + 1}</h2>')
+        parts.append(paragraph)
+    data = {
+        'id': 1,
+        'title': 'A very long article',
+        'slug': 'long-article',
+        'excerpt': 'Benchmark article.',
+        'content': ''.join(parts),
+        'author': 'TerraLumen Team',
+        'published_at': '2020-01-01T00:00:00Z',
+        'is_member_only': False,
+        'tags': ['plasma'],
+    }
+    with open(blog_dir / 'long-article.json', 'w', encoding='utf-8') as f:
+        json.dump(data, f)
+    return len(data['content'])
+
+def measure(client, runs):
+    """Median TTFB and total time in milliseconds over runs requests"""
+    ttfb, total = [], []
+    for _ in range(runs):
+        started = time.perf_counter()
+        response = client.get('/blog/long-article', buffered=False, headers={'Accept-Encoding': 'gzip'})
+        chunks = iter(response.response)
+        next(chunks, b'')
+        ttfb.append(time.perf_counter() - started)
+        for _chunk in chunks:
+            pass
+        total.append(time.perf_counter() - started)
+        response.close()
+    return statistics.median(ttfb) * 1000, statistics.median(total) * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--paragraphs', type=int, default=3000)
+    parser.add_argument('--runs', type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ.setdefault('DATABASE_URL', f'sqlite:///{tmp}/bench.db')
+        from app import create_app
+        from app.utils import blog_loader, content_pipeline
+
+        blog_dir = Path(tmp) / 'blog'
+        blog_dir.mkdir()
+        size = write_article(blog_dir, args.paragraphs)
+        blog_loader._article_cache = blog_loader.ArticleCache(
+            blog_dir, Path(tmp) / 'blog.bundle', Path(tmp) / 'blog.generation')
+        content_pipeline._rendered_cache = content_pipeline.RenderedContentCache(Path(tmp) / 'html_cache')
+
+        app = create_app()
+        client = app.test_client()
+        print(f"Article body: {size / 1024:.0f} KiB, {args.runs} runs per mode")
+        for label, streaming in (('buffered', False), ('streamed', True)):
+            app.config['STREAM_TEMPLATES'] = streaming
+            measure(client, 2)  # warm caches
+            ttfb, total = measure(client, args.runs)
+            print(f"{label:<10} TTFB {ttfb:8.2f} ms   total {total:8.2f} ms")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+"""
+Import-time budget for application startup
+
+Boots the app in a fresh interpreter with `python -X importtime`, reports
+the slowest top-level imports and checks them against
+benchmarks/import_budget.json: a total boot budget, per-module budgets and
+modules that must not be imported at startup at all (they belong to routes
+that import them on first use). Exits non-zero when the budget is exceeded.
+
+Usage:
+    python benchmarks/import_budget.py [--top 15] [--runs 3]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+BUDGET_PATH = Path(__file__).resolve().parent / 'import_budget.json'
+
+BOOT_SNIPPET = (
+    "import sys, time\n"
+    "started = time.perf_counter()\n"
+    "from app import app\n"
+    "print(f'BOOT_MS {(time.perf_counter() - started) * 1000:.3f}', file=sys.stderr)\n"
+)
+
+def boot_once():
+    """Boot the app in a subprocess; return (boot ms, {module: cumulative us}, imported set)"""
+    env = dict(os.environ)
+    env.pop('FLASK_RUN_FROM_CLI', None)
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', BOOT_SNIPPET],
+                            cwd=ROOT, env=env, capture_output=True, text=True)
+    if result.returncode != 0:
+        sys.stderr.write(result.stderr)
+        raise SystemExit(f"App failed to boot (exit {result.returncode})")
+    boot_ms = None
+    cumulative = {}
+    imported = set()
+    for line in result.stderr.splitlines():
+        if line.startswith('BOOT_MS '):
+            boot_ms = float(line.split()[1])
+        elif line.startswith('import time:') and '|' in line:
+            _, cumulative_us, name = line[len('import time:'):].split('|')
+            if not cumulative_us.strip().isdigit():
+                continue  # header line
+            module = name.strip()
+            imported.add(module)
+            # Indentation marks nested imports; only top-level ones are attributed
+            if len(name) - len(name.lstrip()) == 1:
+                cumulative[module] = cumulative.get(module, 0) + int(cumulative_us)
+    return boot_ms, cumulative, imported
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--top', type=int, default=15)
+    parser.add_argument('--runs', type=int, default=3)
+    args = parser.parse_args()
+
+    with open(BUDGET_PATH, 'r', encoding='utf-8') as f:
+        budget = json.load(f)
+
+    boots = []
+    samples = defaultdict(list)
+    imported = set()
+    for _ in range(args.runs):
+        boot_ms, cumulative, names = boot_once()
+        boots.append(boot_ms)
+        imported |= names
+        for module, us in cumulative.items():
+            samples[module].append(us / 1000)
+    module_ms = {module: statistics.median(values) for module, values in samples.items()}
+
+    print(f"{'module':<40} {'cumulative ms':>14}")
+    for module, ms in sorted(module_ms.items(), key=lambda item: -item[1])[:args.top]:
+        print(f"{module:<40} {ms:14.1f}")
+    boot_ms = statistics.median(boots)
+    print(f"\nboot (median of {args.runs}): {boot_ms:.1f} ms, budget {budget['boot_ms']} ms")
+
+    failures = []
+    if boot_ms > budget['boot_ms']:
+        failures.append(f"boot took {boot_ms:.1f} ms (budget {budget['boot_ms']} ms)")
+    for module, limit in budget.get('modules_ms', {}).items():
+        if module_ms.get(module, 0) > limit:
+            failures.append(f"{module} took {module_ms[module]:.1f} ms (budget {limit} ms)")
+    for module in budget.get('forbidden', []):
+        loaded = sorted(name for name in imported if name == module or name.startswith(module + '.'))
+        if loaded:
+            failures.append(f"{module} is imported at startup ({len(loaded)} modules)")
+
+    if failures:
+        print("\nOver budget:")
+        for failure in failures:
+            print(f"  ✗ {failure}")
+        raise SystemExit(1)
+    print("✓ Within import budget")
+
+if __name__ == '__main__':
+    main()
@@ -2,6 +2,7 @@
 Gunicorn configuration for Render deployment
 """
 import os
+import sys
 import multiprocessing
 
 # Server socket
@@ -9,8 +10,9 @@ bind = f"0.0.0.0:{os.environ.get('PORT', '5000')}"
 backlog = 2048
 
 # Worker processes
-# Use fewer workers on Render to avoid memory issues
-workers = min(multiprocessing.cpu_count() * 2 + 1, 4)
+# Use fewer workers on Render to avoid memory issues; WEB_CONCURRENCY overrides
+# (with preloading, `flask memory-report` shows what each extra worker costs)
+workers = int(os.environ.get('WEB_CONCURRENCY') or min(multiprocessing.cpu_count() * 2 + 1, 4))
 worker_class = 'sync'
 worker_connections = 1000
 timeout = 30
@@ -23,6 +25,27 @@ errorlog = '-'
 loglevel = 'info'
 access_log_format = '%(h)s %(l)s %(u)s %(t)s "%(r)s" %(s)s %(b)s "%(f)s" "%(a)s" %(D)s'
 
+# Build the app in the master and fork workers from it, so caches and
+# imported modules are shared copy-on-write between workers
+preload_app = os.environ.get('GUNICORN_PRELOAD', 'true').lower() in ['true', 'on', '1']
+
+def when_ready(server):
+    """Warm caches and freeze the gc in the master before the workers fork"""
+    if not server.cfg.preload_app:
+        return
+    from app import get_app
+    from app.utils.prefork import warm_master
+    result = warm_master(get_app())
+    print(f"✓ Master warmed in {result['elapsed_ms']} ms: {result['articles']} articles, "
+          f"{result['templates']} templates, modules {result['modules']}, "
+          f"{result['frozen_objects']} objects frozen", file=sys.stderr)
+
+def post_fork(server, worker):
+    if server.cfg.preload_app:
+        from app import get_app
+        from app.utils.prefork import after_fork
+        after_fork(get_app())
+
 # Process naming
 proc_name = 'terralumen'
 
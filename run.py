@@ -14,9 +14,9 @@ print("=" * 50, file=sys.stderr)
 
 try:
     print("Importing app module...", file=sys.stderr)
-    from app import create_app, db
+    from app import get_app, db
     print("Creating Flask app...", file=sys.stderr)
-    app = create_app()
+    app = get_app()
     print("✓ Flask app created successfully!", file=sys.stderr)
 except Exception as e:
     print(f"✗ Error creating app: {e}", file=sys.stderr)
@@ -2,4 +2,4 @@
 set -e
 
 echo "Starting TerraLumen with gunicorn..."
-exec gunicorn wsgi:app --bind 0.0.0.0:${PORT:-5000} --workers 2 --timeout 30 --access-logfile - --error-logfile -
+exec gunicorn wsgi:app --config gunicorn_config.py
@@ -18,11 +18,11 @@ try:
     if _current_dir not in sys.path:
         sys.path.insert(0, _current_dir)
     
-    # Import create_app from the app package (the directory app/)
-    from app import create_app
+    # Import the app factory from the app package (the directory app/)
+    from app import get_app
     
-    # Create the Flask application instance
-    app = create_app()
+    # Get the process-wide Flask application instance (built once, shared with 'app:app')
+    app = get_app()
     
 except Exception as e:
     # Method 2: If that fails, load run.py directly